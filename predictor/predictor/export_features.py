@@ -12,6 +12,7 @@ import argparse
 import logging
 from datetime import datetime, timedelta
 from typing import Optional
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 from sqlalchemy import create_engine
@@ -67,33 +68,40 @@ class FeatureExporter:
 
         logger.info(f"Processing {len(products)} products")
 
+        # A full export reads whole tables: None skips the id filter (and lets the loader bulk-read)
+        filtered = productIds is not None
+        exportProductIds = products['id'].tolist() if filtered else None
+
         # Load all data upfront (more efficient than per-product queries)
         logger.info("Loading product daily stats...")
         productStats = self.dataLoader.loadProductDailyStats(
             paddedStart,
             endDate,
-            products['id'].tolist()
+            exportProductIds
         )
 
         logger.info("Loading store daily stats...")
         storeStats = self.dataLoader.loadStoreDailyStats(
             paddedStart,
             endDate,
-            products['storeId'].unique().tolist()
+            products['storeId'].unique().tolist() if filtered else None
         )
 
         logger.info("Loading variants...")
-        variants = self.dataLoader.loadVariants(products['id'].tolist())
+        variants = self.dataLoader.loadVariants(exportProductIds)
 
         logger.info("Loading inventory...")
-        variantIds = variants['id'].tolist() if not variants.empty else []
+        if filtered:
+            variantIds = variants['id'].tolist() if not variants.empty else []
+        else:
+            variantIds = None
         inventory = self.dataLoader.loadInventory(variantIds)
 
         logger.info("Loading reviews...")
         reviews = self.dataLoader.loadReviews(
             paddedStart,
             endDate,
-            products['id'].tolist()
+            exportProductIds
         )
 
         # Generate snapshot dates
@@ -105,8 +113,8 @@ class FeatureExporter:
 
         logger.info(f"Generating features for {len(snapshotDates)} days")
 
-        # Process products in batches
-        allRows = []
+        # Process products in batches; each product contributes one column-wise frame
+        frames = []
         totalProducts = len(products)
 
         for batchStart in range(0, totalProducts, batchSize):
@@ -121,7 +129,7 @@ class FeatureExporter:
                 desc=f"Batch {batchStart//batchSize + 1}"
             ):
                 try:
-                    rows = self._buildProductFeatures(
+                    productFrame = self._buildProductFeatures(
                         product['id'],
                         product['storeId'],
                         snapshotDates,
@@ -131,18 +139,19 @@ class FeatureExporter:
                         inventory,
                         reviews
                     )
-                    allRows.extend(rows)
+                    if not productFrame.empty:
+                        frames.append(productFrame)
                 except Exception as e:
                     logger.error(f"Failed to process product {product['id']}: {e}")
                     continue
 
         # Save to CSV
-        if not allRows:
+        if not frames:
             logger.warning("No feature rows generated")
             return
 
         logger.info("Converting to DataFrame and saving...")
-        dfOut = pd.DataFrame(allRows)
+        dfOut = pd.concat(frames, ignore_index=True)
 
         # Ensure column order matches feature config
         columns = [
@@ -174,7 +183,7 @@ class FeatureExporter:
         variants: pd.DataFrame,
         inventory: pd.DataFrame,
         reviews: pd.DataFrame
-    ) -> list[dict]:
+    ) -> pd.DataFrame:
         """Build feature rows for a single product"""
 
         # Create extended date index (with padding)
@@ -242,45 +251,47 @@ class FeatureExporter:
             else None
         )
 
-        # Build feature rows for each snapshot
-        rows = []
-        paddingOffset = featureConfig.paddingDays
-
+        # Keep snapshots that fall inside the padded date range
+        snapshotsInRange = []
+        dateIndices = []
         for snapshotDate in snapshotDates:
-            # Find index in full date range
             dateIdx = (snapshotDate.date() - dateIndex[0].date()).days
+            if 0 <= dateIdx < len(dateIndex):
+                snapshotsInRange.append(snapshotDate)
+                dateIndices.append(dateIdx)
+
+        if not snapshotsInRange:
+            return pd.DataFrame()
+
+        # Build all feature rows for the product at once
+        features = self.featureEngineer.buildFeatureMatrix(
+            productId=productId,
+            storeId=storeId,
+            snapshotDates=snapshotsInRange,
+            dateIndices=dateIndices,
+            rollingWindows=rollingWindows,
+            storeTs=storeTs,
+            priceStats=priceStats,
+            inventoryByDate=inventoryByDate,
+            reviewsCount=reviewsCount,
+            reviewsAvg=reviewsAvg,
+            lastRestockDate=lastRestockDate
+        )
 
-            if dateIdx < 0 or dateIdx >= len(dateIndex):
-                continue
-
-            # Build features
-            featureRow = self.featureEngineer.buildFeatureRow(
-                productId=productId,
-                storeId=storeId,
-                snapshotDate=snapshotDate,
-                dateIndex=dateIdx,
-                rollingWindows=rollingWindows,
-                storeTs=storeTs,
-                priceStats=priceStats,
-                inventoryByDate=inventoryByDate,
-                reviewsCount=reviewsCount,
-                reviewsAvg=reviewsAvg,
-                lastRestockDate=lastRestockDate
-            )
-
-            # Compute label
-            label = self.featureEngineer.computeLabel(
+        # Compute labels
+        labels = [
+            self.featureEngineer.computeLabel(
                 productId=productId,
                 snapshotDate=snapshotDate,
-                inventoryQty=featureRow['inventoryQty'],
+                inventoryQty=int(inventoryQty),
                 productStatsDf=productStats
             )
+            for snapshotDate, inventoryQty in zip(snapshotsInRange, features['inventoryQty'].values)
+        ]
+        features['futureSales14d'] = np.array([l['futureSales14d'] for l in labels], dtype=np.int64)
+        features['stockout14d'] = np.array([l['stockout14d'] for l in labels], dtype=np.int64)
 
-            # Merge features and label
-            featureRow.update(label)
-            rows.append(featureRow)
-
-        return rows
+        return features
 
     def _logStatistics(self, df: pd.DataFrame) -> None:
         """Log dataset statistics"""
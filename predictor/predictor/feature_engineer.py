@@ -56,51 +56,39 @@ class FeatureEngineer:
         dateIndex: pd.DatetimeIndex
     ) -> pd.Series:
         """
-        Compute inventory snapshot for each date using merge_asof
-        Optimized version with better performance
+        Compute inventory snapshot for each date via searchsorted
+        over each variant's sorted update times
         """
         if invDf.empty or not variantIds:
             return pd.Series(0, index=dateIndex, dtype=np.int64)
 
         # Filter to relevant variants
-        invSub = invDf[invDf['variantId'].isin(variantIds)].copy()
+        invSub = invDf[invDf['variantId'].isin(variantIds)]
         if invSub.empty:
             return pd.Series(0, index=dateIndex, dtype=np.int64)
 
-        invSub = invSub.sort_values('updatedAt')
+        snapshotTimes = dateIndex.values
+        totalQty = np.zeros(len(dateIndex), dtype=np.int64)
 
-        # Prepare snapshot times
-        snapshotDf = pd.DataFrame({'snapshotTime': dateIndex})
-
-        # Compute total quantity by date
-        totalQty = pd.Series(0, index=dateIndex, dtype=np.int64)
+        # Assuming absolute snapshots (DB "updatedAt" rows), not UCI-style deltas
+        for _, variantRows in invSub.groupby('variantId', sort=False):
+            updateTimes = variantRows['updatedAt'].values
+            order = np.argsort(updateTimes, kind='stable')
+            updateTimes = updateTimes[order]
+            # Ensure inventory doesn't go below zero if data is messy
+            quantities = variantRows['quantity'].fillna(0).values[order].astype(np.int64).clip(min=0)
 
-        # Process per variant (vectorized within each variant)
-        for variantId in invSub['variantId'].unique():
-            variantRows = invSub[invSub['variantId'] == variantId].copy()
+            # First row wins on duplicate timestamps
+            keep = np.ones(len(updateTimes), dtype=bool)
+            keep[1:] = updateTimes[1:] != updateTimes[:-1]
+            updateTimes = updateTimes[keep]
+            quantities = quantities[keep]
 
-            # If this came from UCI raw data (negative/positive quantities), we need cumulative sum
-            # But if it came from your DB snapshots (absolute quantity), we use asof
-            # Assuming absolute snapshots here based on "updatedAt" column name context
+            # Last update at or before each snapshot; -1 means none yet
+            idx = np.searchsorted(updateTimes, snapshotTimes, side='right') - 1
+            totalQty += np.where(idx >= 0, quantities[np.maximum(idx, 0)], 0)
 
-            variantRows = variantRows[['updatedAt', 'quantity']].drop_duplicates('updatedAt')
-            variantRows = variantRows.sort_values('updatedAt')
-            variantRows = variantRows.rename(columns={'updatedAt': 'ts', 'quantity': 'qty'})
-
-            # Merge asof for this variant
-            merged = pd.merge_asof(
-                snapshotDf.rename(columns={'snapshotTime': 'ts'}),
-                variantRows,
-                on='ts',
-                direction='backward'
-            )
-
-            merged['qty'] = merged['qty'].fillna(0).astype(np.int64)
-            # Ensure inventory doesn't go below zero if data is messy
-            merged['qty'] = merged['qty'].clip(lower=0)
-            totalQty += merged['qty'].values
-
-        return totalQty
+        return pd.Series(totalQty, index=dateIndex)
 
     def computeReviewsCumulative(
         self,
@@ -109,18 +97,27 @@ class FeatureEngineer:
         dateIndex: pd.DatetimeIndex
     ) -> tuple[pd.Series, pd.Series]:
         """Compute cumulative review count and average rating"""
-        if reviewsDf.empty or productId not in reviewsDf['productId'].unique():
+        if reviewsDf.empty:
             return (
                 pd.Series(0, index=dateIndex, dtype=np.int64),
                 pd.Series(0.0, index=dateIndex, dtype=np.float64)
             )
 
-        reviews = reviewsDf[reviewsDf['productId'] == productId].copy()
-        reviews['date'] = reviews['createdAt'].dt.date
+        mask = (reviewsDf['productId'] == productId).values
+        if not mask.any():
+            return (
+                pd.Series(0, index=dateIndex, dtype=np.int64),
+                pd.Series(0.0, index=dateIndex, dtype=np.float64)
+            )
+
+        # Normalize stays in datetime64; .dt.date would box every row into a Python date
+        createdAt = reviewsDf['createdAt'][mask]
+        if createdAt.dt.tz is not None:
+            createdAt = createdAt.dt.tz_localize(None)
+        days = createdAt.dt.normalize()
 
         # Aggregate by date
-        agg = reviews.groupby('date')['rating'].agg(['count', 'sum']).sort_index()
-        agg.index = pd.to_datetime(agg.index)
+        agg = reviewsDf['rating'][mask].groupby(days.values).agg(['count', 'sum'])
 
         # Reindex to full date range
         agg = agg.reindex(dateIndex, fill_value=0)
@@ -136,12 +133,21 @@ class FeatureEngineer:
         self,
         ts: pd.DataFrame
     ) -> dict[str, pd.DataFrame]:
-        """Compute rolling window aggregations"""
-        windows = {
-            '7d': ts.rolling(window=self.config.window7d, min_periods=1).sum(),
-            '14d': ts.rolling(window=self.config.window14d, min_periods=1).sum(),
-            '30d': ts.rolling(window=self.config.window30d, min_periods=1).sum(),
-        }
+        """Compute rolling window aggregations from one shared cumulative sum"""
+        values = ts.to_numpy(dtype=np.float64)
+        # Leading zero row so a window sum is cs[end] - cs[start]
+        cs = np.zeros((len(values) + 1, values.shape[1]), dtype=np.float64)
+        np.nancumsum(values, axis=0, out=cs[1:])
+
+        ends = np.arange(1, len(values) + 1)
+        windows = {}
+        for key, size in (
+            ('7d', self.config.window7d),
+            ('14d', self.config.window14d),
+            ('30d', self.config.window30d),
+        ):
+            starts = np.maximum(ends - size, 0)
+            windows[key] = pd.DataFrame(cs[ends] - cs[starts], index=ts.index, columns=ts.columns)
         return windows
 
     def buildFeatureRow(
@@ -159,50 +165,92 @@ class FeatureEngineer:
         lastRestockDate: Optional[datetime]
     ) -> dict[str, any]:
         """Build a single feature row for given snapshot (MLP logic)"""
+        return self.buildFeatureMatrix(
+            productId=productId,
+            storeId=storeId,
+            snapshotDates=[snapshotDate],
+            dateIndices=[dateIndex],
+            rollingWindows=rollingWindows,
+            storeTs=storeTs,
+            priceStats=priceStats,
+            inventoryByDate=inventoryByDate,
+            reviewsCount=reviewsCount,
+            reviewsAvg=reviewsAvg,
+            lastRestockDate=lastRestockDate
+        ).to_dict('records')[0]
+
+    def buildFeatureMatrix(
+        self,
+        productId: str,
+        storeId: Optional[str],
+        snapshotDates: list[datetime],
+        dateIndices: list[int],
+        rollingWindows: dict[str, pd.DataFrame],
+        storeTs: pd.DataFrame,
+        priceStats: dict[str, float],
+        inventoryByDate: pd.Series,
+        reviewsCount: pd.Series,
+        reviewsAvg: pd.Series,
+        lastRestockDate: Optional[datetime]
+    ) -> pd.DataFrame:
+        """Build feature rows for all snapshots of a product as one column-wise frame"""
+        idx = np.asarray(dateIndices, dtype=np.intp)
+        n = len(idx)
 
-        ro7 = rollingWindows['7d'].iloc[dateIndex]
-        ro14 = rollingWindows['14d'].iloc[dateIndex]
-        ro30 = rollingWindows['30d'].iloc[dateIndex]
+        ro7 = rollingWindows['7d']
+        ro14 = rollingWindows['14d']
+        ro30 = rollingWindows['30d']
 
         # Sales metrics
-        sales7d = int(ro7['purchases'])
-        sales14d = int(ro14['purchases'])
-        sales30d = int(ro30['purchases'])
-        views7d = int(ro7['views'])
-        views30d = int(ro30['views'])
-        addToCarts7d = int(ro7['addToCarts'])
+        sales7d = ro7['purchases'].values[idx].astype(np.int64)
+        sales14d = ro14['purchases'].values[idx].astype(np.int64)
+        sales30d = ro30['purchases'].values[idx].astype(np.int64)
+        views7d = ro7['views'].values[idx].astype(np.int64)
+        views30d = ro30['views'].values[idx].astype(np.int64)
+        addToCarts7d = ro7['addToCarts'].values[idx].astype(np.int64)
 
         # Derived metrics
         sales7dPerDay = sales7d / 7.0
         sales30dPerDay = sales30d / 30.0
-        salesRatio7To30 = sales7d / sales30d if sales30d > 0 else 0.0
-        viewToPurchase7d = sales7d / views7d if views7d > 0 else 0.0
+        salesRatio7To30 = np.divide(
+            sales7d, sales30d, out=np.zeros(n, dtype=np.float64), where=sales30d > 0
+        )
+        viewToPurchase7d = np.divide(
+            sales7d, views7d, out=np.zeros(n, dtype=np.float64), where=views7d > 0
+        )
 
         # Store metrics
-        storeViews7d = int(storeTs.iloc[dateIndex]['views']) if not storeTs.empty else 0
-        storePurchases7d = int(storeTs.iloc[dateIndex]['purchases']) if not storeTs.empty else 0
-
-        # Inventory
-        inventoryQty = int(inventoryByDate.iloc[dateIndex])
-
-        # Days since restock (relative to snapshot date, not current)
-        if lastRestockDate and lastRestockDate <= snapshotDate:
-            daysSinceRestock = (snapshotDate.date() - lastRestockDate.date()).days
+        if not storeTs.empty:
+            storeViews7d = storeTs['views'].values[idx].astype(np.int64)
+            storePurchases7d = storeTs['purchases'].values[idx].astype(np.int64)
+        else:
+            storeViews7d = np.zeros(n, dtype=np.int64)
+            storePurchases7d = np.zeros(n, dtype=np.int64)
+
+        # Snapshot dates at day precision for the restock and temporal features
+        snapshotTimes = pd.DatetimeIndex(snapshotDates)
+        snapshotDays = snapshotTimes.values.astype('datetime64[D]')
+
+        # Days since restock (relative to snapshot date, not current); 365 for unknown
+        if lastRestockDate:
+            restock = pd.Timestamp(lastRestockDate)
+            restockDay = np.datetime64(restock.date(), 'D')
+            daysSinceRestock = np.where(
+                restock.to_datetime64() <= snapshotTimes.values,
+                (snapshotDays - restockDay).astype(np.int64),
+                365
+            )
         else:
-            daysSinceRestock = 365  # Default for unknown
+            daysSinceRestock = np.full(n, 365, dtype=np.int64)
 
         # Temporal features
-        dayOfWeek = snapshotDate.weekday()
-        isWeekend = 1 if dayOfWeek >= 5 else 0
-
-        # Reviews
-        avgRating = float(reviewsAvg.iloc[dateIndex])
-        ratingCount = int(reviewsCount.iloc[dateIndex])
+        dayOfWeek = snapshotTimes.dayofweek.values.astype(np.int64)
+        isWeekend = (dayOfWeek >= 5).astype(np.int64)
 
-        return {
+        return pd.DataFrame({
             'productId': productId,
             'storeId': storeId,
-            'snapshotDate': snapshotDate.strftime('%Y-%m-%d'),
+            'snapshotDate': snapshotTimes.strftime('%Y-%m-%d'),
             # Features (must match featureConfig.featureColumns order)
             'sales7d': sales7d,
             'sales14d': sales14d,
@@ -214,18 +262,18 @@ class FeatureEngineer:
             'views30d': views30d,
             'addToCarts7d': addToCarts7d,
             'viewToPurchase7d': viewToPurchase7d,
-            'avgPrice': priceStats['avg'],
-            'minPrice': priceStats['min'],
-            'maxPrice': priceStats['max'],
-            'avgRating': avgRating,
-            'ratingCount': ratingCount,
-            'inventoryQty': inventoryQty,
+            'avgPrice': float(priceStats['avg']),
+            'minPrice': float(priceStats['min']),
+            'maxPrice': float(priceStats['max']),
+            'avgRating': reviewsAvg.values[idx].astype(np.float64),
+            'ratingCount': reviewsCount.values[idx].astype(np.int64),
+            'inventoryQty': inventoryByDate.values[idx].astype(np.int64),
             'daysSinceRestock': daysSinceRestock,
             'storeViews7d': storeViews7d,
             'storePurchases7d': storePurchases7d,
             'dayOfWeek': dayOfWeek,
             'isWeekend': isWeekend,
-        }
+        }, index=pd.RangeIndex(n))
 
     def computeLabel(
         self,
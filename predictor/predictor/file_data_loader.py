@@ -3,6 +3,7 @@ Data loading from file utilities
 """
 from __future__ import annotations
 import logging
+from pathlib import Path
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -15,9 +16,15 @@ class FileDataLoader:
         pass
 
     def load_from_file(self, file_path: str) -> pd.DataFrame:
-        """Load data from excel file"""
+        """Load data from an excel file (or CSV/parquet, picked by extension)"""
         try:
-            df = pd.read_excel(file_path)
+            suffix = Path(file_path).suffix.lower()
+            if suffix == '.csv':
+                df = pd.read_csv(file_path)
+            elif suffix == '.parquet':
+                df = pd.read_parquet(file_path)
+            else:
+                df = pd.read_excel(file_path)
             logger.info(f"Loaded {len(df)} rows from {file_path}")
             return df
         except Exception as e:
@@ -162,7 +162,7 @@ class BatchFeatureProcessor:
         ts_df['dayOfWeek'] = ts_df['date'].dt.dayofweek.astype(float)
         ts_df['dayOfMonth'] = ts_df['date'].dt.day.astype(float)
         ts_df['month'] = ts_df['date'].dt.month.astype(float)
-        ts_df['isWeekend'] = ts_df['dayOfWeek'].apply(lambda x: 1.0 if x >= 5.0 else 0.0)
+        ts_df['isWeekend'] = (ts_df['dayOfWeek'] >= 5).astype(float)
 
         # Log transforms (stabilize training)
         # Clip negative values to 0 to prevent log errors
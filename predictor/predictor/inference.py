@@ -0,0 +1,148 @@
+"""
+MLP inference helpers shared by the HTTP (serve) and RabbitMQ (serve_rabbitmq) prediction servers.
+"""
+from __future__ import annotations
+import logging
+from functools import lru_cache, partial
+from operator import itemgetter
+from typing import Optional, Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from .config import serverConfig
+from .case_transformer import CaseTransformer
+from .onnx_runtime import HAS_ONNXRUNTIME, buildOnnxPredictFn
+from .tflite_quantize import buildTfliteInt8PredictFn
+
+logger = logging.getLogger(__name__)
+
+# Length of the synthetic history used to warm up the TFT model
+WARMUP_HISTORY_DAYS = 60
+
+# Risk label bins: score > 0.7 is 'high', > 0.4 'medium', otherwise 'low'
+LABEL_THRESHOLDS = np.array([0.4, 0.7])
+LABELS = np.array(['low', 'medium', 'high'])
+
+@lru_cache(maxsize=8)
+def _featureIndex(columns: tuple[str, ...]) -> dict[str, int]:
+    """Snake-case feature key -> column position for the model's feature columns"""
+    return {CaseTransformer.camelToSnake(col): j for j, col in enumerate(columns)}
+
+@lru_cache(maxsize=8)
+def _featureGetter(columns: tuple[str, ...]) -> itemgetter:
+    """One C-level gather of every feature column, for rows keyed exactly like the model"""
+    return itemgetter(*columns)
+
+@lru_cache(maxsize=4)
+def _scalerVectors(scaler: Any) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    """(mean, 1/scale) of a StandardScaler-like scaler, so the hot path skips sklearn's input validation"""
+    if not hasattr(scaler, 'mean_'): return None
+    mean, scale = scaler.mean_, getattr(scaler, 'scale_', None)
+    if mean is None and scale is None: return None
+    nCols = len(mean if mean is not None else scale)
+    if mean is None or not getattr(scaler, 'with_mean', True): mean = np.zeros(nCols)
+    if scale is None or not getattr(scaler, 'with_std', True): scale = np.ones(nCols)
+    return np.asarray(mean, dtype=np.float64), 1.0 / np.asarray(scale, dtype=np.float64)
+
+def buildFeatureMatrix(featureRows: list[dict[str, Any]], scalerInfo: dict[str, Any]) -> np.ndarray:
+    """Build one (rows, features) matrix and scale it in a single transform call"""
+    columns = tuple(scalerInfo['columns'])
+    index = _featureIndex(columns)
+    getter = _featureGetter(columns)
+    # Preallocated once; each row's known keys are written straight into place
+    X = np.zeros((len(featureRows), len(index)), dtype=np.float64)
+    for i, features in enumerate(featureRows):
+        try:
+            X[i] = getter(features)
+            continue
+        except KeyError:
+            # Partial rows or snake_case keys: map key by key, missing columns stay 0
+            pass
+        row = X[i]
+        for key, value in features.items():
+            j = index.get(CaseTransformer.camelToSnake(key))
+            if j is not None: row[j] = value
+
+    scaler = scalerInfo.get('scaler')
+    if scaler is not None:
+        vectors = _scalerVectors(scaler)
+        if vectors is None:
+            X = scaler.transform(X)
+        else:
+            np.subtract(X, vectors[0], out=X)
+            np.multiply(X, vectors[1], out=X)
+    # LightGBM copies any input that isn't C-contiguous float64; this is a no-op when it already is
+    return np.ascontiguousarray(X, dtype=np.float64)
+
+def buildFeatureArray(features: dict[str, Any], scalerInfo: dict[str, Any]) -> np.ndarray:
+    """Build a single (1, features) row"""
+    return buildFeatureMatrix([features], scalerInfo)
+
+def mlpLabel(score: float) -> str:
+    return 'high' if score > 0.7 else ('medium' if score > 0.4 else 'low')
+
+def mlpLabels(scores: np.ndarray) -> list[str]:
+    """Labels for a whole score vector in one vectorized threshold lookup"""
+    bins = np.searchsorted(LABEL_THRESHOLDS, scores)
+    # searchsorted sorts NaN past every threshold; the scalar comparisons label it 'low'
+    bins[np.isnan(scores)] = 0
+    return LABELS[bins].tolist()
+
+def buildPredictFn(model: Any, modelType: str, scalerInfo: dict[str, Any]) -> Callable[[np.ndarray], np.ndarray]:
+    """Bind the cheapest inference entry point for the loaded MLP model"""
+    nCols = len(scalerInfo['columns'])
+    if modelType == 'keras' and serverConfig.quantize:
+        try:
+            return buildTfliteInt8PredictFn(model, nCols)
+        except Exception as e:
+            logger.warning(f"int8 quantization failed, falling back: {e}")
+
+    if serverConfig.useOnnx and HAS_ONNXRUNTIME:
+        try:
+            return buildOnnxPredictFn(model, modelType, nCols)
+        except Exception as e:
+            logger.warning(f"ONNX conversion failed, using native {modelType} inference: {e}")
+
+    if modelType == 'keras':
+        # model.predict() runs progbar/metrics/data-adapter setup on every call; a traced forward pass doesn't
+        import tensorflow as tf
+        forward = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec((None, nCols), tf.float32)],
+            jit_compile=serverConfig.useXla
+        )
+        return lambda X: forward(tf.constant(X, dtype=tf.float32)).numpy()
+    # Parallelism comes from the predict pool / worker processes, so each call stays single-threaded
+    return partial(model.predict, num_iteration=model.best_iteration or None, num_threads=1)
+
+def predictScores(predictFn: Callable[[np.ndarray], Any], X: np.ndarray) -> np.ndarray:
+    """Model scores for a feature matrix as a flat array"""
+    return np.asarray(predictFn(X), dtype=np.float64).reshape(-1)
+
+def warmupHistory() -> list[dict[str, Any]]:
+    """Synthetic all-zero daily history long enough for one TFT prediction"""
+    start = pd.Timestamp('2024-01-01')
+    return [
+        {'date': (start + pd.Timedelta(days=i)).strftime('%Y-%m-%d'), 'purchases': 0.0, 'inventoryQty': 0.0}
+        for i in range(WARMUP_HISTORY_DAYS)
+    ]
+
+def warmup(
+        modelType: str,
+        scalerInfo: Optional[dict[str, Any]],
+        scoreMatrix: Callable[[np.ndarray], np.ndarray],
+        predictTft: Callable[[list[dict[str, Any]]], Any]
+) -> None:
+    """Run one dummy prediction so the first request doesn't pay lazy-init cost"""
+    try:
+        if modelType == 'tft':
+            predictTft(warmupHistory())
+        else:
+            # Trace both the single-row shape and the full batch shape
+            zeros = {col: 0.0 for col in scalerInfo['columns']}
+            scoreMatrix(buildFeatureArray(zeros, scalerInfo))
+            scoreMatrix(buildFeatureMatrix([zeros] * serverConfig.maxBatchSize, scalerInfo))
+        logger.info("Model warm-up complete")
+    except Exception as e:
+        logger.warning(f"Model warm-up failed: {e}")
@@ -0,0 +1,74 @@
+"""
+ONNX Runtime inference for the MLP models (LightGBM / Keras)
+"""
+from __future__ import annotations
+import logging
+from typing import Any, Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Optional imports
+try:
+    import onnxruntime as ort
+    HAS_ONNXRUNTIME = True
+except ImportError:
+    HAS_ONNXRUNTIME = False
+
+INPUT_NAME = 'input'
+
+
+def _convertLightGBM(model: Any, nCols: int) -> bytes:
+    """Convert a LightGBM Booster to a serialized ONNX graph"""
+    from onnxmltools import convert_lightgbm
+    from onnxmltools.convert.common.data_types import FloatTensorType
+
+    onnxModel = convert_lightgbm(
+        model,
+        initial_types=[(INPUT_NAME, FloatTensorType([None, nCols]))],
+        zipmap=False
+    )
+    return onnxModel.SerializeToString()
+
+
+def _convertKeras(model: Any, nCols: int) -> bytes:
+    """Convert a Keras model to a serialized ONNX graph"""
+    import tensorflow as tf
+    import tf2onnx
+
+    onnxModel, _ = tf2onnx.convert.from_keras(
+        model,
+        input_signature=[tf.TensorSpec((None, nCols), tf.float32, name=INPUT_NAME)]
+    )
+    return onnxModel.SerializeToString()
+
+
+def buildOnnxPredictFn(model: Any, modelType: str, nCols: int) -> Callable[[np.ndarray], np.ndarray]:
+    """Convert the loaded model once and return a callable scoring float matrices via ONNX Runtime"""
+    if not HAS_ONNXRUNTIME:
+        raise RuntimeError("onnxruntime not installed")
+
+    if modelType == 'lightgbm':
+        serialized = _convertLightGBM(model, nCols)
+    elif modelType == 'keras':
+        serialized = _convertKeras(model, nCols)
+    else:
+        raise ValueError(f"ONNX conversion not supported for model type: {modelType}")
+
+    # Requests are already spread over the predict pool; one intra-op thread keeps per-call latency flat
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = 1
+    session = ort.InferenceSession(serialized, sess_options=options, providers=['CPUExecutionProvider'])
+    inputName = session.get_inputs()[0].name
+
+    if modelType == 'lightgbm':
+        # Outputs are (label, probabilities[n, 2]); the positive-class column is the score
+        def predict(X: np.ndarray) -> np.ndarray:
+            return session.run(None, {inputName: np.asarray(X, dtype=np.float32)})[1][:, 1]
+    else:
+        def predict(X: np.ndarray) -> np.ndarray:
+            return session.run(None, {inputName: np.asarray(X, dtype=np.float32)})[0]
+
+    logger.info(f"ONNX Runtime session ready for {modelType} model")
+    return predict
@@ -0,0 +1,467 @@
+"""
+FastAPI prediction server supporting both MLP (Legacy) and TFT (Time-Series) models.
+"""
+from __future__ import annotations
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Callable, List
+from pathlib import Path
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request, Depends, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, ValidationError
+import joblib
+import numpy as np
+import pandas as pd
+
+from .config import serverConfig
+from . import inference
+from .inference import mlpLabel, mlpLabels
+
+logging.basicConfig(
+    level=serverConfig.logLevel.upper(),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+model = None
+scalerInfo = None
+modelType = None
+predictFn = None  # MLP inference callable resolved once at startup
+
+# Upper bound on rows accepted by /predict_batch
+MAX_BATCH_ROWS = 1000
+
+app = FastAPI(
+    title="SwiftEcommerce Predictor API",
+    description="Unified ML prediction service (MLP/TFT)",
+    version=serverConfig.modelVersion
+)
+
+class DailyStat(BaseModel):
+    date: str
+    purchases: float
+    views: float = 0.0
+    revenue: float = 0.0
+    inventoryQty: float
+
+class PredictRequest(BaseModel):
+    features: Optional[dict[str, Any]] = None
+    history: Optional[List[DailyStat]] = None
+    productId: Optional[str] = None
+    storeId: Optional[str] = None
+
+class BatchRow(BaseModel):
+    productId: Optional[str] = None
+    storeId: Optional[str] = None
+    features: Optional[dict[str, Any]] = None
+    history: Optional[List[DailyStat]] = None
+
+class BatchRequest(BaseModel):
+    rows: list[BatchRow] = Field(..., description="List of prediction rows")
+
+class PredictionResponse(BaseModel):
+    productId: Optional[str] = None
+    storeId: Optional[str] = None
+    score: float
+    label: str
+    forecast_p50: Optional[float] = None
+    forecast_p90: Optional[float] = None
+    model_confidence: Optional[float] = None
+    modelVersion: str
+
+class BatchPredictionResponse(BaseModel):
+    results: list[dict[str, Any]]
+    modelVersion: str
+    processedCount: int
+
+class HealthResponse(BaseModel):
+    status: str
+    modelType: str
+    modelVersion: str
+    featuresCount: Optional[int] = None
+
+@app.on_event("startup")
+async def startup():
+    global model, scalerInfo, modelType, predictFn
+    logger.info(f"Initializing service with MODEL_TYPE={serverConfig.modelType}")
+    predictFn = None
+    # Bounded pool for model.predict calls; LightGBM and torch release the GIL while they compute.
+    # Created per lifespan so a restarted app in the same process gets a live pool.
+    app.state.predictExecutor = ThreadPoolExecutor(
+        max_workers=serverConfig.predictWorkers, thread_name_prefix='predict'
+    )
+
+    # Backends are imported here so a deploy only loads the framework it serves
+    if serverConfig.modelType == 'tft':
+        try:
+            import torch
+            from pytorch_forecasting import TemporalFusionTransformer
+        except ImportError:
+            raise RuntimeError("TFT libs missing")
+        model = TemporalFusionTransformer.load_from_checkpoint(
+            serverConfig.modelPath,
+            map_location=torch.device("cpu")
+        )
+        model.eval()
+        modelType = 'tft'
+    else:
+        scalerInfo = joblib.load(serverConfig.scalerPath)
+        if serverConfig.modelType == 'keras' or Path(serverConfig.modelPath).suffix in ('.h5', '.keras'):
+            modelType = 'keras'
+            import tensorflow as tf
+            model = tf.keras.models.load_model(serverConfig.modelPath)
+        else:
+            modelType = 'lightgbm'
+            import lightgbm as lgb
+            model = lgb.Booster(model_file=serverConfig.modelPath)
+        predictFn = inference.buildPredictFn(model, modelType, scalerInfo)
+
+    _warmup()
+    if modelType != 'tft':
+        microBatcher.start()
+    logger.info(f"Startup complete. Active Model: {modelType}")
+
+@app.on_event("shutdown")
+async def shutdown():
+    await microBatcher.stop()
+    executor = getattr(app.state, 'predictExecutor', None)
+    app.state.predictExecutor = None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+async def _runBlocking(fn, *args):
+    """Run blocking inference on the predict pool so the event loop keeps serving requests"""
+    loop = asyncio.get_running_loop()
+    # Outside a lifespan (no startup ran) fall back to the loop's default executor
+    return await loop.run_in_executor(getattr(app.state, 'predictExecutor', None), fn, *args)
+
+def _jsonBody(schema: type[BaseModel]) -> Callable:
+    """Body dependency validating raw JSON bytes in pydantic-core, skipping the json.loads -> dict -> validate round trip"""
+    async def parse(request: Request) -> BaseModel:
+        try:
+            return schema.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError([
+                {**err, 'loc': ('body', *err['loc'])} for err in e.errors(include_url=False)
+            ])
+    return parse
+
+def _bodySchema(schema: type[BaseModel]) -> dict:
+    """OpenAPI requestBody for endpoints reading the body through _jsonBody"""
+    return {'requestBody': {'required': True, 'content': {'application/json': {'schema': schema.model_json_schema()}}}}
+
+def _predict_tft(history: List[DailyStat], productId: str, storeId: str) -> tuple[float, str, float, float, float]:
+    if not history: raise ValueError("History required for TFT")
+
+    data = [h.model_dump() for h in history]
+    df = pd.DataFrame(data)
+
+    df['date'] = pd.to_datetime(df['date'])
+    df['productId'] = str(productId) if productId else 'unknown'
+    df['storeId'] = str(storeId) if storeId else 'unknown'
+
+    # Fix numerical types
+    cols = ['purchases', 'views', 'revenue', 'inventoryQty']
+    for c in cols:
+        if c in df.columns: df[c] = df[c].astype(float)
+        else: df[c] = 0.0
+
+    df = df.sort_values('date')
+    df['time_idx'] = (df['date'] - df['date'].min()).dt.days
+    df['dayOfWeek'] = df['date'].dt.dayofweek
+    df['dayOfMonth'] = df['date'].dt.day
+    df['isWeekend'] = df['dayOfWeek'].apply(lambda x: 1 if x >= 5 else 0)
+
+    df['log_purchases'] = np.log1p(df['purchases'])
+    df['log_views'] = np.log1p(df['views'])
+
+    df['productId'] = df['productId'].astype(str)
+    df['storeId'] = df['storeId'].astype(str)
+
+    import torch
+    with torch.no_grad():
+        raw = model.predict(df, mode="quantiles", return_x=False)
+        # Sum p10/p50/p90 (indices 1, 3, 5) over the horizon in one reduction
+        p10, p50, p90 = raw[0, :, [1, 3, 5]].sum(dim=0).tolist()
+
+        # Confidence calculation
+        uncertainty_range = p90 - p10
+        rel_uncertainty = uncertainty_range / (p50 + 1.0)
+        model_confidence = max(0.0, 1.0 - rel_uncertainty)
+
+    current_inv = history[-1].inventoryQty
+
+    label = 'low'
+    if p50 > current_inv: label = 'high'
+    elif p90 > current_inv: label = 'medium'
+
+    score = 0.1
+    if label == 'high': score = 0.95
+    elif label == 'medium': score = 0.55
+
+    return score, label, p50, p90, model_confidence
+
+def buildFeatureMatrix(featureRows: list[dict[str, Any]]) -> np.ndarray:
+    """Build one scaled (rows, features) matrix for the loaded model"""
+    return inference.buildFeatureMatrix(featureRows, scalerInfo)
+
+def buildFeatureArray(features: dict[str, Any]) -> np.ndarray:
+    """Build a single (1, features) row"""
+    return inference.buildFeatureArray(features, scalerInfo)
+
+def _predict_mlp_scores(X: np.ndarray) -> np.ndarray:
+    """Model scores for a feature matrix as a flat array"""
+    return inference.predictScores(predictFn or model.predict, X)
+
+def _predict_mlp(features: dict[str, Any]) -> tuple[float, str, float, float, float]:
+    if features is None: raise ValueError("Features required")
+    score = float(_predict_mlp_scores(buildFeatureArray(features))[0])
+    return score, mlpLabel(score), 0.0, 0.0, 0.0
+
+class MicroBatcher:
+    """Coalesce concurrent single-row MLP predictions into one model call"""
+
+    def __init__(self, maxBatchSize: int, maxLatencyMs: float):
+        self.maxBatchSize = maxBatchSize
+        self.maxLatency = maxLatencyMs / 1000.0
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self) -> None:
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
+        # Nothing will score what is still queued; fail it so callers don't wait forever
+        if self.queue is not None:
+            pending = []
+            while not self.queue.empty():
+                pending.append(self.queue.get_nowait())
+            self._fail(pending)
+
+    @staticmethod
+    def _fail(items: list[tuple[dict[str, Any], asyncio.Future]]) -> None:
+        for _, future in items:
+            if not future.done():
+                future.set_exception(RuntimeError("Predictor is shutting down"))
+
+    async def submit(self, features: dict[str, Any]) -> float:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((features, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        items = []
+        try:
+            while True:
+                items = [await self.queue.get()]
+                deadline = loop.time() + self.maxLatency
+                while len(items) < self.maxBatchSize:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0: break
+                    try:
+                        items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                await self._score(items)
+        except asyncio.CancelledError:
+            # Cancelled mid-collection or mid-score: the batch in hand will never be resolved
+            self._fail(items)
+            raise
+
+    async def _score(self, items: list[tuple[dict[str, Any], asyncio.Future]]) -> None:
+        try:
+            scores = await _runBlocking(
+                lambda: _predict_mlp_scores(buildFeatureMatrix([features for features, _ in items]))
+            )
+            outcomes = [(score, None) for score in scores.tolist()]
+        except Exception as e:
+            if len(items) == 1:
+                outcomes = [(None, e)]
+            else:
+                # One bad row shouldn't fail its neighbours; rescore them individually
+                for item in items: await self._score([item])
+                return
+
+        for (_, future), (score, error) in zip(items, outcomes):
+            if future.done(): continue
+            if error is not None: future.set_exception(error)
+            else: future.set_result(score)
+
+microBatcher = MicroBatcher(serverConfig.maxBatchSize, serverConfig.maxBatchLatencyMs)
+
+def _warmup() -> None:
+    """Run one dummy prediction so the first request doesn't pay lazy-init cost"""
+    inference.warmup(
+        modelType, scalerInfo, _predict_mlp_scores,
+        lambda history: _predict_tft([DailyStat(**day) for day in history], 'warmup', 'warmup')
+    )
+
+@app.middleware("http")
+async def authMiddleware(request: Request, callNext):
+    """Reject bad tokens on prediction routes before the body is read or validated"""
+    if (serverConfig.authToken and request.url.path.startswith("/predict")
+            and request.headers.get("X-Internal-Token") != serverConfig.authToken):
+        return JSONResponse({"detail": "Invalid or missing authentication token"}, status_code=status.HTTP_401_UNAUTHORIZED)
+    return await callNext(request)
+
+@app.post("/predict", response_model=PredictionResponse, openapi_extra=_bodySchema(PredictRequest))
+async def predictSingle(request: PredictRequest = Depends(_jsonBody(PredictRequest))):
+    try:
+        if modelType == 'tft':
+            score, label, p50, p90, conf = await _runBlocking(_predict_tft, request.history, request.productId, request.storeId)
+        elif microBatcher.running:
+            if request.features is None: raise ValueError("Features required")
+            score = await microBatcher.submit(request.features)
+            label, p50, p90, conf = mlpLabel(score), 0.0, 0.0, 0.0
+        else:
+            score, label, p50, p90, conf = await _runBlocking(_predict_mlp, request.features)
+
+        return PredictionResponse(
+            productId=request.productId,
+            storeId=request.storeId,
+            score=score,
+            label=label,
+            forecast_p50=p50,
+            forecast_p90=p90,
+            model_confidence=conf,
+            modelVersion=serverConfig.modelVersion
+        )
+    except Exception as e:
+        logger.error(f"Prediction error: {e}")
+        raise HTTPException(status_code=500, detail=f"Prediction error: {e}")
+
+@app.post("/predict_batch", response_model=BatchPredictionResponse, openapi_extra=_bodySchema(BatchRequest))
+async def predictBatch(request: BatchRequest = Depends(_jsonBody(BatchRequest))):
+    if not request.rows:
+        raise HTTPException(status_code=400, detail="No rows provided")
+    if len(request.rows) > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_BATCH_ROWS} rows per batch")
+
+    if modelType != 'tft':
+        try:
+            return await _predictBatchMlp(request.rows)
+        except Exception as e:
+            logger.error(f"Batch prediction error: {e}")
+            raise HTTPException(status_code=500, detail=f"Batch prediction error: {e}")
+
+    results = []
+    for i, row in enumerate(request.rows):
+        try:
+            score, label, p50, p90, conf = await _runBlocking(_predict_tft, row.history, row.productId, row.storeId)
+
+            results.append({
+                'index': i,
+                'score': score,
+                'label': label,
+                'forecast_p50': p50,
+                'forecast_p90': p90,
+                'model_confidence': conf,
+                'productId': row.productId
+            })
+        except Exception as e:
+            results.append({'index': i, 'error': str(e)})
+
+    return BatchPredictionResponse(
+        results=results,
+        modelVersion=serverConfig.modelVersion,
+        processedCount=len(results)
+    )
+
+async def _scoreTiled(X: np.ndarray) -> np.ndarray:
+    """Score a feature matrix in fixed-size row tiles spread over the predict pool"""
+    tile = serverConfig.predictTileRows
+    if len(X) <= tile:
+        return await _runBlocking(_predict_mlp_scores, X)
+    parts = await asyncio.gather(*(
+        _runBlocking(_predict_mlp_scores, X[start:start + tile]) for start in range(0, len(X), tile)
+    ))
+    return np.concatenate(parts)
+
+def _mlpResult(i: int, row: BatchRow, score: float, label: str) -> dict[str, Any]:
+    return {
+        'index': i,
+        'score': score,
+        'label': label,
+        'forecast_p50': 0.0,
+        'forecast_p90': 0.0,
+        'model_confidence': 0.0,
+        'productId': row.productId
+    }
+
+async def _predictBatchMlp(rows: list[BatchRow]) -> BatchPredictionResponse:
+    """Score all MLP rows from one feature matrix, tiled across the predict pool"""
+    results: list[dict[str, Any]] = [None] * len(rows)
+    validIdx = []
+    for i, row in enumerate(rows):
+        if row.features is None:
+            results[i] = {'index': i, 'error': "Features required"}
+        else:
+            validIdx.append(i)
+
+    if validIdx:
+        try:
+            X = await _runBlocking(buildFeatureMatrix, [rows[i].features for i in validIdx])
+            scores = await _scoreTiled(X)
+            for i, score, label in zip(validIdx, scores.tolist(), mlpLabels(scores)):
+                results[i] = _mlpResult(i, rows[i], score, label)
+        except Exception as e:
+            # One bad row shouldn't fail its neighbours; rescore them individually
+            logger.warning(f"Batch scoring failed, rescoring rows individually: {e}")
+            for i in validIdx:
+                try:
+                    score, label, _, _, _ = await _runBlocking(_predict_mlp, rows[i].features)
+                    results[i] = _mlpResult(i, rows[i], score, label)
+                except Exception as rowError:
+                    results[i] = {'index': i, 'error': str(rowError)}
+
+    return BatchPredictionResponse(
+        results=results,
+        modelVersion=serverConfig.modelVersion,
+        processedCount=len(results)
+    )
+
+@app.get("/")
+async def root():
+    return {'service': 'Stockout Predictor', 'version': serverConfig.modelVersion, 'status': 'running'}
+
+@app.get("/health", response_model=HealthResponse)
+async def health():
+    return HealthResponse(
+        status="healthy",
+        modelType=str(modelType),
+        modelVersion=serverConfig.modelVersion,
+        featuresCount=len(scalerInfo['columns']) if scalerInfo else None
+    )
+
+def main():
+    # Multiple workers need the import string; loop/http 'auto' pick uvloop/httptools when installed
+    uvicorn.run(
+        "predictor.serve:app",
+        host=serverConfig.host,
+        port=serverConfig.port,
+        workers=serverConfig.workers,
+        loop="auto",
+        http="auto",
+        log_level=serverConfig.logLevel
+    )
+
+if __name__ == "__main__":
+    main()
@@ -10,17 +10,16 @@ import pandas as pd
 import pika
 from pathlib import Path
 
-# Conditional imports
+# orjson emits the same JSON wire format as the stdlib, several times faster
 try:
-    import torch
-    import lightning.pytorch as pl
-    from pytorch_forecasting import TemporalFusionTransformer
-    HAS_TFT = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_TFT = False
+    HAS_ORJSON = False
 
 from .config import serverConfig
-from .case_transformer import CaseTransformer
+from . import inference
+from .inference import mlpLabel, mlpLabels
 from .rabbitmq import RabbitMQ
 
 logging.basicConfig(
@@ -32,14 +31,21 @@ logger = logging.getLogger(__name__)
 model = None
 scalerInfo = None
 modelType = None
+predictFn = None  # MLP inference callable resolved once at startup
 
 def startup():
-    global model, scalerInfo, modelType
+    global model, scalerInfo, modelType, predictFn
     logger.info(f"Starting RabbitMQ worker with MODEL_TYPE={serverConfig.modelType}")
+    predictFn = None
 
 
+    # Backends are imported here so a deploy only loads the framework it serves
     if serverConfig.modelType == 'tft':
-        if not HAS_TFT: raise RuntimeError("TFT libs missing")
+        try:
+            import torch
+            from pytorch_forecasting import TemporalFusionTransformer
+        except ImportError:
+            raise RuntimeError("TFT libs missing")
         logger.info(f"Loading TFT model from {serverConfig.modelPath}")
         model = TemporalFusionTransformer.load_from_checkpoint(
             serverConfig.modelPath,
@@ -50,7 +56,7 @@ def startup():
     else:
         logger.info(f"Loading Legacy model from {serverConfig.modelPath}")
         scalerInfo = joblib.load(serverConfig.scalerPath)
-        if serverConfig.modelType == 'keras' or Path(serverConfig.modelPath).suffix == '.h5':
+        if serverConfig.modelType == 'keras' or Path(serverConfig.modelPath).suffix in ('.h5', '.keras'):
             import tensorflow as tf
             model = tf.keras.models.load_model(serverConfig.modelPath)
             modelType = 'keras'
@@ -58,8 +64,10 @@ def startup():
             import lightgbm as lgb
             model = lgb.Booster(model_file=serverConfig.modelPath)
             modelType = 'lightgbm'
+        predictFn = inference.buildPredictFn(model, modelType, scalerInfo)
 
     logger.info(f"Model loaded: {modelType}")
+    _warmup()
 
 def _predict_tft_single(row):
     history = row.get('history', [])
@@ -92,13 +100,13 @@ def _predict_tft_single(row):
 
     current = float(history[-1].get('inventoryQty', 0))
 
+    import torch
     with torch.no_grad():
         # Predict
         raw = model.predict(df, mode="quantiles", return_x=False)
 
-        # Summing predictions over the forecast horizon
-        p50 = raw[0, :, 3].sum().item() # Median
-        p90 = raw[0, :, 5].sum().item() # P90
+        # Summing median (3) and P90 (5) over the forecast horizon in one reduction
+        p50, p90 = raw[0, :, [3, 5]].sum(dim=0).tolist()
 
          # Confidence Calculation: Median / (Conservative_Max + epsilon)
         model_confidence = p50 / (p90 + 1e-3)
@@ -124,50 +132,105 @@ def _predict_tft_single(row):
 
     return score, label, p50, p90, model_confidence, days_until_stockout
 
+def buildFeatureMatrix(featureRows):
+    """Build one scaled (rows, features) matrix for the loaded model"""
+    return inference.buildFeatureMatrix(featureRows, scalerInfo)
+
+def buildFeatureArray(features):
+    """Build a single (1, features) row"""
+    return inference.buildFeatureArray(features, scalerInfo)
+
+def _predict_mlp_scores(X):
+    """Model scores for a feature matrix as a flat array"""
+    return inference.predictScores(predictFn or model.predict, X)
+
 def _predict_mlp_single(row):
     feat = row.get('features')
     if not feat: return 0.0, 'error', 0, 0, 0.0
 
-    fs = CaseTransformer.transformKeysToSnake(feat)
-    vec = [fs.get(c, 0) for c in scalerInfo['columns']]
-    arr = np.array(vec).reshape(1, -1)
-    if 'scaler' in scalerInfo:
-        arr = scalerInfo['scaler'].transform(arr)
-
-    if modelType == 'lightgbm':
-        score = float(model.predict(arr)[0])
-    else:
-        score = float(model.predict(arr)[0][0])
-
-    label = 'high' if score > 0.7 else ('medium' if score > 0.4 else 'low')
-    return score, label, 0, 0, 0.0
+    score = float(_predict_mlp_scores(buildFeatureArray(feat))[0])
+    return score, mlpLabel(score), 0, 0, 0.0
+
+def _mlp_result(i, row, score, label):
+    return {
+        'index': i,
+        'score': score,
+        'label': label,
+        'forecast_p50': 0,
+        'forecast_p90': 0,
+        'model_confidence': 0.0,
+        'days_until_stockout': None,
+        'productId': row.get('productId')
+    }
+
+def _predict_mlp_rows(rows):
+    """Score all rows with one feature matrix and one model call"""
+    results = [None] * len(rows)
+    valid = []
+    for i, row in enumerate(rows):
+        if row.get('features'):
+            valid.append(i)
+        else:
+            results[i] = {'index': i, 'error': 'Features required'}
+
+    if valid:
+        try:
+            scores = _predict_mlp_scores(buildFeatureMatrix([rows[i]['features'] for i in valid]))
+            for i, score, label in zip(valid, scores.tolist(), mlpLabels(scores)):
+                results[i] = _mlp_result(i, rows[i], score, label)
+        except Exception as e:
+            # One bad row shouldn't fail its neighbours; rescore them individually
+            logger.warning(f"Batch err, rescoring rows individually: {e}")
+            for i in valid:
+                try:
+                    score, label, _, _, _ = _predict_mlp_single(rows[i])
+                    results[i] = _mlp_result(i, rows[i], score, label)
+                except Exception as row_err:
+                    results[i] = {'index': i, 'error': str(row_err)}
+
+    return results
+
+def _warmup():
+    """Run one dummy prediction so the first message doesn't pay lazy-init cost"""
+    inference.warmup(
+        modelType, scalerInfo, _predict_mlp_scores,
+        lambda history: _predict_tft_single({'productId': 'warmup', 'storeId': 'warmup', 'history': history})
+    )
+
+def _loads(body):
+    return orjson.loads(body) if HAS_ORJSON else json.loads(body)
+
+def _dumps(obj):
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj)
+
+def _predict_tft_rows(rows):
+    results = []
+    for i, row in enumerate(rows):
+        try:
+            score, label, p50, p90, conf, days_until_stockout = _predict_tft_single(row)
+
+            results.append({
+                'index': i,
+                'score': score,
+                'label': label,
+                'forecast_p50': p50,
+                'forecast_p90': p90,
+                'model_confidence': conf,
+                'days_until_stockout': days_until_stockout,
+                'productId': row.get('productId')
+            })
+        except Exception as e:
+            logger.error(f"Err {i}: {e}")
+            results.append({'index': i, 'error': str(e)})
+    return results
 
 def on_message(ch, method, properties, body):
     try:
-        req = json.loads(body)
+        req = _loads(body)
         rows = req.get('data', {}).get('rows', [])
-        results = []
-
-        for i, row in enumerate(rows):
-            try:
-                if modelType == 'tft':
-                    score, label, p50, p90, conf, days_until_stockout = _predict_tft_single(row)
-                else:
-                    score, label, p50, p90, conf = _predict_mlp_single(row)
-
-                results.append({
-                    'index': i,
-                    'score': score,
-                    'label': label,
-                    'forecast_p50': p50,
-                    'forecast_p90': p90,
-                    'model_confidence': conf,
-                    'days_until_stockout': days_until_stockout,
-                    'productId': row.get('productId')
-                })
-            except Exception as e:
-                logger.error(f"Err {i}: {e}")
-                results.append({'index': i, 'error': str(e)})
+        results = _predict_tft_rows(rows) if modelType == 'tft' else _predict_mlp_rows(rows)
 
         resp = {'results': results, 'modelVersion': serverConfig.modelVersion}
 
@@ -176,7 +239,7 @@ def on_message(ch, method, properties, body):
                 exchange='',
                 routing_key=properties.reply_to,
                 properties=pika.BasicProperties(correlation_id=properties.correlation_id),
-                body=json.dumps(resp)
+                body=_dumps(resp)
             )
     except Exception as e:
         logger.error(f"MQ Error: {e}")
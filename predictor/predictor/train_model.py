@@ -15,18 +15,16 @@ from pathlib import Path
 from typing import Optional
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import (
     roc_auc_score,
-    precision_recall_curve,
-    auc,
+    average_precision_score,
     classification_report
 )
 import joblib
 
 from .config import featureConfig, modelConfig
-from .train_tft import TFTTrainer
+from .train_tft import TFTTrainer, cpu_supports_amx_bf16
 
 logging.basicConfig(
     level=logging.INFO,
@@ -42,6 +40,11 @@ except ImportError:
     HAS_LIGHTGBM = False
     logger.warning("LightGBM not installed")
 
+# oneDNN must be configured before TensorFlow is imported; BF16 fpmath only pays off on AMX hosts
+os.environ.setdefault('TF_ENABLE_ONEDNN_OPTS', '1')
+if cpu_supports_amx_bf16():
+    os.environ.setdefault('ONEDNN_DEFAULT_FPMATH_MODE', 'BF16')
+
 try:
     import tensorflow as tf
     from tensorflow import keras
@@ -50,6 +53,12 @@ except ImportError:
     HAS_TENSORFLOW = False
     logger.warning("TensorFlow not installed")
 
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 
 class ModelTrainer:
     """Model training with evaluation and persistence"""
@@ -61,13 +70,31 @@ class ModelTrainer:
                 setattr(self.config, key, value)
 
         self.featureColumns = featureConfig.featureColumns
+        self.featureColumnsSet = featureConfig.featureColumnsSet
+        self.categoricalFeatures = [
+            col for col in featureConfig.categoricalColumns if col in self.featureColumnsSet
+        ]
         self.scaler: Optional[StandardScaler] = None
         self.model = None
 
     def loadData(self, csvPath: str) -> tuple[np.ndarray, np.ndarray, pd.DataFrame]:
-        """Load and prepare training data"""
+        """Load and prepare training data from a CSV (or a .feather file when pyarrow is available)"""
         logger.info(f"Loading data from {csvPath}")
-        df = pd.read_csv(csvPath)
+        if Path(csvPath).suffix == '.feather':
+            return self.loadDataFrame(pd.read_feather(csvPath))
+
+        # Only parse the label and feature columns; the header tells us which of them exist
+        header = pd.read_csv(csvPath, nrows=0).columns
+        wanted = self.featureColumnsSet | {'stockout14d'}
+        usecols = [col for col in header if col in wanted]
+        readOptions = {'engine': 'pyarrow'} if HAS_PYARROW else {}
+        df = pd.read_csv(csvPath, usecols=usecols, dtype=np.float32, **readOptions)
+        return self.loadDataFrame(df)
+
+    def loadDataFrame(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, pd.DataFrame]:
+        """Prepare training data from an in-memory DataFrame, as loadData does for a CSV"""
+        wanted = self.featureColumnsSet | {'stockout14d'}
+        df = df[[col for col in df.columns if col in wanted]]
 
         # Drop rows with missing labels
         initialSize = len(df)
@@ -78,11 +105,13 @@ class ModelTrainer:
         for col in self.featureColumns:
             if col not in df.columns:
                 logger.warning(f"Missing feature column: {col}, filling with 0")
-                df[col] = 0.0
 
-        # Extract features and labels
-        X = df[self.featureColumns].fillna(0).astype(float).values
-        y = df['stockout14d'].astype(int).values
+        # Extract features and labels into one contiguous float32 block
+        X = np.ascontiguousarray(
+            df.reindex(columns=self.featureColumns, fill_value=0.0)
+            .to_numpy(dtype=np.float32, na_value=0.0)
+        )
+        y = df['stockout14d'].to_numpy(dtype=np.int8)
 
         logger.info(f"Loaded {len(X)} samples with {X.shape[1]} features")
         logger.info(f"Class distribution: {np.bincount(y)}")
@@ -100,21 +129,56 @@ class ModelTrainer:
         testSize = testSize or self.config.testSize
         randomState = randomState or self.config.randomState
 
-        # Stratified split to maintain class distribution
-        stratify = y if len(np.unique(y)) > 1 else None
-
-        XTrain, XVal, yTrain, yVal = train_test_split(
-            X, y,
-            test_size=testSize,
-            random_state=randomState,
-            stratify=stratify
-        )
+        # Stratified split to maintain class distribution: shuffle each class's row
+        # indices once and give every class its share of the validation rows
+        rng = np.random.default_rng(randomState)
+        classes, counts = np.unique(y, return_counts=True)
+        nVal = int(np.ceil(len(y) * testSize))
+
+        # Largest-remainder allocation so per-class quotas add up to nVal exactly
+        quotas = counts * nVal / len(y)
+        nValPerClass = np.floor(quotas).astype(int)
+        shortfall = nVal - nValPerClass.sum()
+        nValPerClass[np.argsort(nValPerClass - quotas)[:shortfall]] += 1
+
+        trainParts, valParts = [], []
+        for cls, nClassVal in zip(classes, nValPerClass):
+            idx = np.flatnonzero(y == cls)
+            rng.shuffle(idx)
+            valParts.append(idx[:nClassVal])
+            trainParts.append(idx[nClassVal:])
+        # Mix the classes back together so neither set comes out sorted by label
+        trainIdx = rng.permutation(np.concatenate(trainParts))
+        valIdx = rng.permutation(np.concatenate(valParts))
+
+        XTrain, XVal = np.take(X, trainIdx, axis=0), np.take(X, valIdx, axis=0)
+        yTrain, yVal = y[trainIdx], y[valIdx]
 
         logger.info(f"Train set: {len(XTrain)} samples")
         logger.info(f"Validation set: {len(XVal)} samples")
 
         return XTrain, XVal, yTrain, yVal
 
+    def trainLightGBM(
+        self,
+        XTrain: np.ndarray,
+        yTrain: np.ndarray,
+        XVal: np.ndarray,
+        yVal: np.ndarray
+    ):
+        """Train a LightGBM model (see train_lightgbm_model)"""
+        return train_lightgbm_model(self, XTrain, yTrain, XVal, yVal)
+
+    def trainKeras(
+        self,
+        XTrain: np.ndarray,
+        yTrain: np.ndarray,
+        XVal: np.ndarray,
+        yVal: np.ndarray
+    ):
+        """Train a Keras model and return (model, scaler) (see train_tensorflow_model)"""
+        return train_tensorflow_model(self, XTrain, yTrain, XVal, yVal)
+
     def evaluate(
         self,
         X: np.ndarray,
@@ -134,16 +198,16 @@ class ModelTrainer:
         # Compute metrics
         aucScore = roc_auc_score(y, yPred)
 
-        precision, recall, _ = precision_recall_curve(y, yPred)
-        aucPr = auc(recall, precision)
+        # Average precision summarises the PR curve from a single sort of the scores
+        aucPr = average_precision_score(y, yPred)
 
-        # Binary predictions at 0.5 threshold
-        yPredBinary = (yPred > 0.5).astype(int)
+        # Binary predictions at 0.5 threshold, reinterpreted in place as int8
+        yPredBinary = (yPred > 0.5).view(np.int8)
 
         logger.info(f"ROC AUC: {aucScore:.4f}")
         logger.info(f"PR AUC: {aucPr:.4f}")
         logger.info("\nClassification Report:")
-        logger.info(classification_report(y, yPredBinary))
+        logger.info(classification_report(y, yPredBinary, zero_division=0))
 
         return {
             'rocAuc': aucScore,
@@ -159,12 +223,12 @@ class ModelTrainer:
         outputDir.mkdir(parents=True, exist_ok=True)
 
         if modelType == 'lightgbm':
-            self.model.save_model(outputPath)
+            # Trees past the early-stopping optimum are never used, so leave them out of the file
+            self.model.save_model(outputPath, num_iteration=self.model.best_iteration)
 
-            # Save scaler (fit on full data for inference)
+            # Trees need no scaling; only the column order is persisted for inference
             scalerPath = outputDir / 'scaler.pkl'
             scalerObj = {
-                'scaler': StandardScaler(),  # Dummy for consistency
                 'columns': self.featureColumns
             }
             joblib.dump(scalerObj, scalerPath)
@@ -173,8 +237,10 @@ class ModelTrainer:
             outputDir = Path(outputPath)
             outputDir.mkdir(parents=True, exist_ok=True)
 
-            modelPath = outputDir / 'model.h5'
-            self.model.save(str(modelPath))
+            # Native Keras format; loads faster than legacy HDF5.
+            # Saved in float32 so a model trained with mixed precision serves full-precision layers on CPU
+            modelPath = outputDir / 'model.keras'
+            _asFloat32Model(self.model).save(str(modelPath))
 
             scalerPath = outputDir / 'scaler.pkl'
             scalerObj = {
@@ -191,10 +257,31 @@ def train_lightgbm_model(trainer, XTrain, yTrain, XVal, yVal):
     if not HAS_LIGHTGBM:
         raise RuntimeError("LightGBM not installed")
 
-    logger.info("Training LightGBM model...")
-
-    trainData = lgb.Dataset(XTrain, label=yTrain)
-    valData = lgb.Dataset(XVal, label=yVal, reference=trainData)
+    params = dict(trainer.config.lgbParams)
+    device = trainer.config.lgbDevice
+    if device in ('gpu', 'cuda'):
+        params.update({'device_type': device, 'max_bin': 255, 'gpu_use_dp': False})
+        # GPU histogram kernels work on contiguous single-precision input
+        XTrain = np.ascontiguousarray(XTrain, dtype=np.float32)
+        XVal = np.ascontiguousarray(XVal, dtype=np.float32)
+    else:
+        # Skip LightGBM's row/col-wise auto-test, which is pure overhead for tall-thin frames
+        params.setdefault('num_threads', os.cpu_count())
+        params.setdefault('force_col_wise', True)
+
+    logger.info(f"Training LightGBM model on {device}...")
+
+    # Bin the training set once up front; the validation set reuses its bin mapper
+    # Name the columns so categorical features can be declared (only when X has the configured layout)
+    datasetOptions = {}
+    if XTrain.shape[1] == len(trainer.featureColumns):
+        datasetOptions = {
+            'feature_name': trainer.featureColumns,
+            'categorical_feature': trainer.categoricalFeatures
+        }
+    trainData = lgb.Dataset(XTrain, label=yTrain, params=params, free_raw_data=True, **datasetOptions)
+    trainData.construct()
+    valData = lgb.Dataset(XVal, label=yVal, reference=trainData, free_raw_data=True)
 
     callbacks = [
         lgb.early_stopping(stopping_rounds=trainer.config.lgbEarlyStopping),
@@ -202,7 +289,7 @@ def train_lightgbm_model(trainer, XTrain, yTrain, XVal, yVal):
     ]
 
     trainer.model = lgb.train(
-        trainer.config.lgbParams,
+        params,
         trainData,
         num_boost_round=trainer.config.lgbNumRounds,
         valid_sets=[trainData, valData],
@@ -261,31 +348,61 @@ def train_tensorflow_model(trainer, XTrain, yTrain, XVal, yVal):
     return trainer.model, trainer.scaler
 
 
+def _asFloat32Model(model):
+    """Copy of a Keras model with every layer in float32, or the model itself if it already is"""
+    if all(layer.dtype_policy.name == 'float32' for layer in model.layers):
+        return model
+
+    # Mixed-precision variables are already float32, so the weights carry over unchanged
+    clone = keras.models.clone_model(
+        model,
+        clone_function=lambda layer: layer.__class__.from_config({**layer.get_config(), 'dtype': 'float32'})
+    )
+    clone.set_weights(model.get_weights())
+    return clone
+
+
 def _buildKerasModel(inputDim: int, config):
     """Build Keras neural network architecture"""
+    # fp16 on GPU Tensor Cores, bf16 on AMX CPUs; layer widths and batch size are kept multiples of 8.
+    # The policy is set per layer rather than globally so it can't leak into other models in the process.
+    mixedPrecision = bool(tf.config.list_physical_devices('GPU'))
+    if mixedPrecision:
+        policy = keras.mixed_precision.Policy('mixed_float16')
+    elif cpu_supports_amx_bf16():
+        policy = keras.mixed_precision.Policy('mixed_bfloat16')
+    else:
+        policy = keras.mixed_precision.Policy('float32')
+
     model = keras.Sequential()
 
     # Input layer
     model.add(keras.layers.Dense(
         config.kerasHiddenLayers[0],
         input_dim=inputDim,
-        activation='relu'
+        activation='relu',
+        dtype=policy
     ))
-    model.add(keras.layers.BatchNormalization())
-    model.add(keras.layers.Dropout(config.kerasDropout))
+    model.add(keras.layers.BatchNormalization(dtype=policy))
+    model.add(keras.layers.Dropout(config.kerasDropout, dtype=policy))
 
     # Hidden layers
     for units in config.kerasHiddenLayers[1:]:
-        model.add(keras.layers.Dense(units, activation='relu'))
-        model.add(keras.layers.BatchNormalization())
-        model.add(keras.layers.Dropout(config.kerasDropout))
+        model.add(keras.layers.Dense(units, activation='relu', dtype=policy))
+        model.add(keras.layers.BatchNormalization(dtype=policy))
+        model.add(keras.layers.Dropout(config.kerasDropout, dtype=policy))
+
+    # Output layer (sigmoid and loss stay in float32 for numerical stability)
+    model.add(keras.layers.Dense(1, activation='sigmoid', dtype='float32'))
 
-    # Output layer
-    model.add(keras.layers.Dense(1, activation='sigmoid'))
+    optimizer = keras.optimizers.Adam(learning_rate=0.001)
+    if mixedPrecision:
+        # Dynamic loss scaling keeps small fp16 gradients from underflowing
+        optimizer = keras.mixed_precision.LossScaleOptimizer(optimizer)
 
     # Compile
     model.compile(
-        optimizer=keras.optimizers.Adam(learning_rate=0.001),
+        optimizer=optimizer,
         loss='binary_crossentropy',
         metrics=[
             keras.metrics.AUC(name='auc'),
@@ -327,6 +444,12 @@ def main():
         default=0.15,
         help='Validation split fraction'
     )
+    parser.add_argument(
+        '--device',
+        choices=['cpu', 'gpu', 'cuda'],
+        default='cpu',
+        help='LightGBM device type (gpu/cuda require a GPU-enabled LightGBM build)'
+    )
 
     args = parser.parse_args()
     
@@ -338,7 +461,7 @@ def main():
         return
 
     # Initialize trainer
-    trainer = ModelTrainer()
+    trainer = ModelTrainer({'lgbDevice': args.device})
 
     # Load data
     X, y, df = trainer.loadData(args.input)
@@ -1,7 +1,13 @@
 import pika
 import json
+import time
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class RabbitMQTest:
     def __init__(self, host='localhost'):
         self.host = host
@@ -20,7 +26,7 @@ class RabbitMQTest:
         if self.corr_id == props.correlation_id:
             self.response = body
 
-    def call(self, message):
+    def call(self, message, timeout=30):
         self.response = None
         self.corr_id = str(uuid.uuid4())
         self.channel.basic_publish(
@@ -30,10 +36,15 @@ class RabbitMQTest:
                 reply_to=self.callback_queue,
                 correlation_id=self.corr_id,
             ),
-            body=json.dumps(message))
+            body=orjson.dumps(message) if orjson else json.dumps(message))
+        # Block on the socket until the reply arrives instead of spinning on zero-timeout polls
+        deadline = time.monotonic() + timeout
         while self.response is None:
-            self.connection.process_data_events()
-        return json.loads(self.response)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No response for {self.corr_id} within {timeout}s")
+            self.connection.process_data_events(time_limit=remaining)
+        return orjson.loads(self.response) if orjson else json.loads(self.response)
 
 if __name__ == '__main__':
     test = RabbitMQTest()
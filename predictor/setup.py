@@ -22,10 +22,26 @@ setup(
             "tensorflow>=2.13.0",
             "joblib>=1.3.0",
         ],
+        # Backend-free server; combine with one of the serve-* extras, e.g. .[serve,serve-lgb]
         "serve": [
             "fastapi>=0.104.0",
             "uvicorn[standard]>=0.24.0",
             "joblib>=1.3.0",
+            "scikit-learn>=1.3.0",
+            "orjson>=3.9.0",
+        ],
+        "serve-lgb": [
+            "lightgbm>=4.0.0",
+            "onnxruntime>=1.16.0",
+            "onnxmltools>=1.12.0",
+        ],
+        "serve-keras": [
+            "tensorflow>=2.13.0",
+        ],
+        "serve-tft": [
+            "torch>=2.2.0",
+            "lightning>=2.0.0",
+            "pytorch-forecasting>=1.0.0",
         ],
     },
     entry_points={
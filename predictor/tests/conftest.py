@@ -5,6 +5,10 @@ import sys
 import os
 from pathlib import Path
 
+# Skip .pyc writes for this process and for spawned xdist workers
+sys.dont_write_bytecode = True
+os.environ.setdefault('PYTHONDONTWRITEBYTECODE', '1')
+
 # Fix import path - add parent directory
 TESTS_DIR = Path(__file__).parent
 PREDICTOR_ROOT = TESTS_DIR.parent
@@ -32,6 +36,23 @@ from sqlalchemy import create_engine
 from sqlalchemy.pool import StaticPool
 import tempfile
 import os
+import warnings
+import joblib  # noqa: F401
+
+# Warm heavy optional imports once per worker during collection, so their cost is not
+# billed to whichever test happens to touch them first in --durations
+try:
+    import lightgbm  # noqa: F401
+except ImportError:
+    pass
+
+try:
+    with warnings.catch_warnings():
+        # Starlette warns about its httpx backend at import; pytest's filters aren't active yet
+        warnings.simplefilter('ignore')
+        from fastapi.testclient import TestClient
+except ImportError:
+    pass
 
 from predictor.config import (
     DatabaseConfig,
@@ -148,42 +169,34 @@ def sample_products():
 @pytest.fixture
 def sample_product_stats():
     """Sample product daily stats"""
-    dates = pd.date_range('2025-01-01', periods=30, freq='D')
-    data = []
-
-    for product_id in ['prod-1', 'prod-2']:
-        for date in dates:
-            data.append({
-                'productId': product_id,
-                'date': date,
-                'views': np.random.randint(50, 200),
-                'purchases': np.random.randint(5, 20),
-                'addToCarts': np.random.randint(10, 40),
-                'revenue': np.random.uniform(100, 500)
-            })
+    dates = pd.date_range('2025-01-01', periods=30, freq='D').to_numpy()
+    n_rows = 2 * len(dates)
 
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        'productId': np.repeat(['prod-1', 'prod-2'], len(dates)),
+        'date': np.tile(dates, 2),
+        'views': np.random.randint(50, 200, size=n_rows),
+        'purchases': np.random.randint(5, 20, size=n_rows),
+        'addToCarts': np.random.randint(10, 40, size=n_rows),
+        'revenue': np.random.uniform(100, 500, size=n_rows)
+    })
 
 
 @pytest.fixture
 def sample_store_stats():
     """Sample store daily stats"""
-    dates = pd.date_range('2025-01-01', periods=30, freq='D')
-    data = []
-
-    for store_id in ['store-1', 'store-2']:
-        for date in dates:
-            data.append({
-                'storeId': store_id,
-                'date': date,
-                'views': np.random.randint(500, 2000),
-                'purchases': np.random.randint(50, 200),
-                'addToCarts': np.random.randint(100, 400),
-                'revenue': np.random.uniform(1000, 5000),
-                'checkouts': np.random.randint(80, 300)
-            })
+    dates = pd.date_range('2025-01-01', periods=30, freq='D').to_numpy()
+    n_rows = 2 * len(dates)
 
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        'storeId': np.repeat(['store-1', 'store-2'], len(dates)),
+        'date': np.tile(dates, 2),
+        'views': np.random.randint(500, 2000, size=n_rows),
+        'purchases': np.random.randint(50, 200, size=n_rows),
+        'addToCarts': np.random.randint(100, 400, size=n_rows),
+        'revenue': np.random.uniform(1000, 5000, size=n_rows),
+        'checkouts': np.random.randint(80, 300, size=n_rows)
+    })
 
 
 @pytest.fixture
@@ -199,41 +212,33 @@ def sample_variants():
 @pytest.fixture
 def sample_inventory():
     """Sample inventory data"""
-    dates = pd.date_range('2025-01-01', periods=30, freq='D')
-    data = []
+    dates = pd.date_range('2025-01-01', periods=30, freq='D').to_numpy()[::5]  # Every 5 days
+    variant_ids = ['var-1', 'var-2', 'var-3']
 
-    for variant_id in ['var-1', 'var-2', 'var-3']:
-        for i, date in enumerate(dates[::5]):  # Every 5 days
-            data.append({
-                'id': f'inv-{variant_id}-{i}',
-                'variantId': variant_id,
-                'quantity': np.random.randint(50, 500),
-                'updatedAt': date
-            })
-
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        'id': [f'inv-{variant_id}-{i}' for variant_id in variant_ids for i in range(len(dates))],
+        'variantId': np.repeat(variant_ids, len(dates)),
+        'quantity': np.random.randint(50, 500, size=len(variant_ids) * len(dates)),
+        'updatedAt': np.tile(dates, len(variant_ids))
+    })
 
 
 @pytest.fixture
 def sample_reviews():
     """Sample reviews data"""
-    dates = pd.date_range('2025-01-01', periods=100, freq='H')
-    data = []
+    dates = pd.date_range('2025-01-01', periods=100, freq='h').to_numpy()
 
-    for i, date in enumerate(dates):
-        data.append({
-            'id': f'review-{i}',
-            'productId': np.random.choice(['prod-1', 'prod-2', 'prod-3']),
-            'rating': np.random.randint(1, 6),
-            'createdAt': date
-        })
-
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        'id': [f'review-{i}' for i in range(len(dates))],
+        'productId': np.random.choice(['prod-1', 'prod-2', 'prod-3'], size=len(dates)),
+        'rating': np.random.randint(1, 6, size=len(dates)),
+        'createdAt': dates
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_features():
-    """Sample feature vectors"""
+    """Sample feature vectors (shared by the session; treat as read-only)"""
     return {
         'sales7d': 50,
         'sales14d': 100,
@@ -319,12 +324,25 @@ def temp_model_dir(tmp_path):
 @pytest.fixture
 def test_client():
     """FastAPI test client"""
-    from fastapi.testclient import TestClient
     from predictor.serve import app
 
     return TestClient(app)
 
 
+# ================================
+# Training Fixtures
+# ================================
+
+@pytest.fixture(autouse=True)
+def fast_training_config(monkeypatch):
+    """Cap boosting rounds and epochs on the shared modelConfig so training tests stay quick"""
+    from predictor.config import modelConfig
+
+    monkeypatch.setattr(modelConfig, 'lgbNumRounds', 20)
+    monkeypatch.setattr(modelConfig, 'lgbEarlyStopping', 5)
+    monkeypatch.setattr(modelConfig, 'kerasEpochs', 2)
+
+
 # ================================
 # Cleanup
 # ================================
@@ -361,13 +379,13 @@ def mock_api_client():
     return MockFastAPIClient()
 
 
-@pytest.fixture
-def mock_model_files(tmp_path):
-    """Create mock model files on disk"""
-    return save_mock_model_files(tmp_path / 'models', model_type='lightgbm')
+@pytest.fixture(scope="session")
+def mock_model_files(tmp_path_factory):
+    """Create mock model files on disk (once per session; read-only)"""
+    return save_mock_model_files(tmp_path_factory.mktemp('models'), model_type='lightgbm')
 
 
-@pytest.fixture
-def mock_keras_files(tmp_path):
-    """Create mock Keras model files on disk"""
-    return save_mock_model_files(tmp_path / 'models', model_type='keras')
\ No newline at end of file
+@pytest.fixture(scope="session")
+def mock_keras_files(tmp_path_factory):
+    """Create mock Keras model files on disk (once per session; read-only)"""
+    return save_mock_model_files(tmp_path_factory.mktemp('models'), model_type='keras')
\ No newline at end of file
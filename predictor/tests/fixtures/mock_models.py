@@ -1,11 +1,17 @@
 """
 Mock models and fixtures for testing ML components
 """
+import pickle
 import numpy as np
+import pandas as pd
+from functools import lru_cache, wraps
 from unittest.mock import Mock, MagicMock
 from typing import Optional, Dict, Any, List
-import joblib
 from pathlib import Path
+from types import SimpleNamespace
+
+# One PCG64 generator shared by every fixture; sized calls instead of the global legacy API
+_RNG = np.random.default_rng(42)
 
 
 class MockLightGBMModel:
@@ -42,7 +48,7 @@ class MockLightGBMModel:
             n_samples = len(data)
 
         # Return random predictions between 0 and 1
-        return np.random.rand(n_samples)
+        return _RNG.random(n_samples)
 
     def save_model(self, filename: str, **kwargs) -> None:
         """Mock save method"""
@@ -59,7 +65,7 @@ class MockLightGBMModel:
         """Mock feature importance"""
         if self._feature_importance is not None:
             return self._feature_importance
-        return np.random.randint(0, 100, self.num_features)
+        return _RNG.integers(0, 100, self.num_features)
 
     def feature_name(self) -> List[str]:
         """Mock feature names"""
@@ -83,32 +89,28 @@ class MockKerasModel:
         self.input_shape = input_shape
         self.output_shape = output_shape
         self.compiled = compiled
-        self.layers = []
         self._history = None
 
-        # Mock layers
-        self._create_mock_layers()
+        # Layer mocks are shared between models with the same shapes; copy before mutating one
+        self.layers = list(self._cached_layers(tuple(input_shape), tuple(output_shape)))
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _cached_layers(input_shape: tuple, output_shape: tuple) -> tuple:
+        """Create mock layer structure once per (input_shape, output_shape)"""
+        layers = []
 
-    def _create_mock_layers(self):
-        """Create mock layer structure"""
         # Input layer
-        input_layer = Mock()
-        input_layer.units = self.input_shape[0]
-        input_layer.activation = Mock(__name__='relu')
-        self.layers.append(input_layer)
+        layers.append(SimpleNamespace(units=input_shape[0], activation=SimpleNamespace(__name__='relu')))
 
         # Hidden layers
         for units in [128, 64]:
-            layer = Mock()
-            layer.units = units
-            layer.activation = Mock(__name__='relu')
-            self.layers.append(layer)
+            layers.append(SimpleNamespace(units=units, activation=SimpleNamespace(__name__='relu')))
 
         # Output layer
-        output_layer = Mock()
-        output_layer.units = self.output_shape[0]
-        output_layer.activation = Mock(__name__='sigmoid')
-        self.layers.append(output_layer)
+        layers.append(SimpleNamespace(units=output_shape[0], activation=SimpleNamespace(__name__='sigmoid')))
+
+        return tuple(layers)
 
     def predict(
         self,
@@ -121,7 +123,7 @@ class MockKerasModel:
         n_samples = x.shape[0]
 
         # Return predictions with shape (n_samples, 1)
-        predictions = np.random.rand(n_samples, 1)
+        predictions = _RNG.random((n_samples, 1))
         return predictions
 
     def fit(
@@ -138,14 +140,13 @@ class MockKerasModel:
         """Mock training method"""
         # Simulate training history
         history = {
-            'loss': list(np.random.rand(epochs)),
-            'auc': list(np.random.rand(epochs)),
-            'val_loss': list(np.random.rand(epochs)),
-            'val_auc': list(np.random.rand(epochs))
+            'loss': _RNG.random(epochs).tolist(),
+            'auc': _RNG.random(epochs).tolist(),
+            'val_loss': _RNG.random(epochs).tolist(),
+            'val_auc': _RNG.random(epochs).tolist()
         }
 
-        self._history = Mock()
-        self._history.history = history
+        self._history = SimpleNamespace(history=history)
 
         return self._history
 
@@ -257,7 +258,6 @@ class MockDataLoader:
         if self.products_data is not None:
             return self.products_data
 
-        import pandas as pd
         return pd.DataFrame({
             'id': ['prod-1', 'prod-2'],
             'storeId': ['store-1', 'store-1']
@@ -273,22 +273,17 @@ class MockDataLoader:
         if self.stats_data is not None:
             return self.stats_data
 
-        import pandas as pd
         dates = pd.date_range(startDate, endDate, freq='D')
+        n_rows = 2 * len(dates)
 
-        data = []
-        for product_id in ['prod-1', 'prod-2']:
-            for date in dates:
-                data.append({
-                    'productId': product_id,
-                    'date': date,
-                    'views': np.random.randint(50, 200),
-                    'purchases': np.random.randint(5, 20),
-                    'addToCarts': np.random.randint(10, 40),
-                    'revenue': np.random.uniform(100, 500)
-                })
-
-        return pd.DataFrame(data)
+        return pd.DataFrame({
+            'productId': np.repeat(['prod-1', 'prod-2'], len(dates)),
+            'date': np.tile(dates.to_numpy(), 2),
+            'views': _RNG.integers(50, 200, size=n_rows),
+            'purchases': _RNG.integers(5, 20, size=n_rows),
+            'addToCarts': _RNG.integers(10, 40, size=n_rows),
+            'revenue': _RNG.uniform(100, 500, size=n_rows)
+        })
 
     def loadStoreDailyStats(
         self,
@@ -297,27 +292,21 @@ class MockDataLoader:
         storeIds: Optional[List[str]] = None
     ):
         """Mock load store stats"""
-        import pandas as pd
         dates = pd.date_range(startDate, endDate, freq='D')
+        n_rows = 2 * len(dates)
 
-        data = []
-        for store_id in ['store-1', 'store-2']:
-            for date in dates:
-                data.append({
-                    'storeId': store_id,
-                    'date': date,
-                    'views': np.random.randint(500, 2000),
-                    'purchases': np.random.randint(50, 200),
-                    'addToCarts': np.random.randint(100, 400),
-                    'revenue': np.random.uniform(1000, 5000),
-                    'checkouts': np.random.randint(80, 300)
-                })
-
-        return pd.DataFrame(data)
+        return pd.DataFrame({
+            'storeId': np.repeat(['store-1', 'store-2'], len(dates)),
+            'date': np.tile(dates.to_numpy(), 2),
+            'views': _RNG.integers(500, 2000, size=n_rows),
+            'purchases': _RNG.integers(50, 200, size=n_rows),
+            'addToCarts': _RNG.integers(100, 400, size=n_rows),
+            'revenue': _RNG.uniform(1000, 5000, size=n_rows),
+            'checkouts': _RNG.integers(80, 300, size=n_rows)
+        })
 
     def loadVariants(self, productIds: Optional[List[str]] = None):
         """Mock load variants"""
-        import pandas as pd
         return pd.DataFrame({
             'id': ['var-1', 'var-2'],
             'productId': ['prod-1', 'prod-1'],
@@ -326,20 +315,15 @@ class MockDataLoader:
 
     def loadInventory(self, variantIds: Optional[List[str]] = None):
         """Mock load inventory"""
-        import pandas as pd
         dates = pd.date_range('2025-01-01', periods=10, freq='D')
+        variant_ids = ['var-1', 'var-2']
 
-        data = []
-        for variant_id in ['var-1', 'var-2']:
-            for date in dates:
-                data.append({
-                    'id': f'inv-{variant_id}-{date}',
-                    'variantId': variant_id,
-                    'quantity': np.random.randint(50, 500),
-                    'updatedAt': date
-                })
-
-        return pd.DataFrame(data)
+        return pd.DataFrame({
+            'id': [f'inv-{variant_id}-{date}' for variant_id in variant_ids for date in dates],
+            'variantId': np.repeat(variant_ids, len(dates)),
+            'quantity': _RNG.integers(50, 500, size=len(variant_ids) * len(dates)),
+            'updatedAt': np.tile(dates.to_numpy(), len(variant_ids))
+        })
 
     def loadReviews(
         self,
@@ -348,28 +332,23 @@ class MockDataLoader:
         productIds: Optional[List[str]] = None
     ):
         """Mock load reviews"""
-        import pandas as pd
-        dates = pd.date_range(startDate, endDate, freq='H')
-
-        data = []
-        for i, date in enumerate(dates):
-            data.append({
-                'id': f'review-{i}',
-                'productId': np.random.choice(['prod-1', 'prod-2']),
-                'rating': np.random.randint(1, 6),
-                'createdAt': date
-            })
+        dates = pd.date_range(startDate, endDate, freq='h')
+        n = len(dates)
 
-        return pd.DataFrame(data)
+        return pd.DataFrame({
+            'id': np.char.add('review-', np.arange(n).astype(str)),
+            'productId': _RNG.choice(['prod-1', 'prod-2'], size=n),
+            'rating': _RNG.integers(1, 6, size=n),
+            'createdAt': dates
+        })
 
 
 class MockEngine:
     """Mock SQLAlchemy engine for testing"""
 
     def __init__(self):
-        self.connection = Mock()
-        self.dialect = Mock()
-        self.dialect.name = 'postgresql'
+        self.connection = SimpleNamespace(execute=lambda *args, **kwargs: None, close=lambda: None)
+        self.dialect = SimpleNamespace(name='postgresql')
 
     def connect(self):
         """Mock connect method"""
@@ -466,16 +445,16 @@ def save_mock_model_files(
         'scaler': create_mock_scaler(n_features),
         'columns': [f'feature_{i}' for i in range(n_features)]
     }
-    joblib.dump(scaler_obj, scaler_path)
+    # Plain pickle (joblib.load reads it) skips joblib's array handling for this tiny dict
+    with open(scaler_path, 'wb') as f:
+        pickle.dump(scaler_obj, f, protocol=5)
 
     files = {'scaler': scaler_path}
 
     if model_type == 'lightgbm':
-        # Create mock model file
+        # Create mock model file; only its existence is checked
         model_path = model_dir / 'model.bin'
-        with open(model_path, 'w') as f:
-            f.write("Mock LightGBM Model\n")
-            f.write(f"Features: {n_features}\n")
+        model_path.touch()
         files['model'] = model_path
 
     elif model_type == 'keras':
@@ -507,7 +486,7 @@ class MockPredictor:
 
     def predict(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Mock single prediction"""
-        score = self.default_score + np.random.uniform(-0.1, 0.1)
+        score = self.default_score + _RNG.uniform(-0.1, 0.1)
         score = np.clip(score, 0, 1)
 
         if score > 0.7:
@@ -528,99 +507,113 @@ class MockPredictor:
         features_list: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """Mock batch prediction"""
+        # Draw and bin every score in one vectorized pass
+        scores = np.clip(self.default_score + _RNG.uniform(-0.1, 0.1, size=len(features_list)), 0, 1)
+        labels = np.where(scores > 0.7, 'high', np.where(scores > 0.4, 'medium', 'low'))
+
         return [
             {
-                **self.predict(features),
+                'score': score,
+                'label': label,
+                'modelVersion': 'v1.0-mock',
                 'index': i
             }
-            for i, features in enumerate(features_list)
+            for i, (score, label) in enumerate(zip(scores.tolist(), labels.tolist()))
         ]
 
 
+def _require_auth(handler):
+    """Reject requests whose X-Internal-Token header does not match the test token"""
+    @wraps(handler)
+    def wrapper(self, json: Dict = None, headers: Dict = None, **kwargs):
+        if headers and headers.get('X-Internal-Token') != 'test-token':
+            return _mock_response(401, {'detail': 'Unauthorized'})
+        return handler(self, json=json, headers=headers, **kwargs)
+    return wrapper
+
+
+def _mock_response(status_code: int, body: Dict) -> Mock:
+    """Build a response mock with the given status and JSON body"""
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = body
+    return response
+
+
 class MockFastAPIClient:
     """Mock FastAPI test client for testing"""
 
     def __init__(self, predictor: Optional[MockPredictor] = None):
         self.predictor = predictor or MockPredictor()
         self.base_url = 'http://testserver'
+        self._get_handlers = {
+            '/': self._handle_root,
+            '/health': self._handle_health
+        }
+        self._post_handlers = {
+            '/predict': self._handle_predict,
+            '/predict_batch': self._handle_predict_batch
+        }
 
     def get(self, path: str, **kwargs):
         """Mock GET request"""
-        response = Mock()
-
-        if path == '/':
-            response.status_code = 200
-            response.json.return_value = {
-                'service': 'Stockout Predictor',
-                'version': 'v1.0-mock'
-            }
-
-        elif path == '/health':
-            response.status_code = 200
-            response.json.return_value = {
-                'status': 'healthy',
-                'modelType': 'lightgbm',
-                'featuresCount': 21
-            }
-
-        else:
-            response.status_code = 404
-            response.json.return_value = {'detail': 'Not found'}
-
-        return response
+        handler = self._get_handlers.get(path)
+        return handler(**kwargs) if handler else self._not_found()
 
     def post(self, path: str, json: Dict = None, headers: Dict = None, **kwargs):
         """Mock POST request"""
-        response = Mock()
+        handler = self._post_handlers.get(path)
+        return handler(json=json, headers=headers, **kwargs) if handler else self._not_found()
 
-        # Check auth
-        if headers and headers.get('X-Internal-Token') != 'test-token':
-            response.status_code = 401
-            response.json.return_value = {'detail': 'Unauthorized'}
-            return response
-
-        if path == '/predict':
-            if not json or 'features' not in json:
-                response.status_code = 400
-                response.json.return_value = {'detail': 'Missing features'}
-            else:
-                response.status_code = 200
-                result = self.predictor.predict(json['features'])
-                result['productId'] = json.get('productId')
-                result['storeId'] = json.get('storeId')
-                response.json.return_value = result
-
-        elif path == '/predict_batch':
-            if not json or 'rows' not in json:
-                response.status_code = 400
-                response.json.return_value = {'detail': 'Missing rows'}
-            elif len(json['rows']) == 0:
-                response.status_code = 400
-                response.json.return_value = {'detail': 'Empty batch'}
-            elif len(json['rows']) > 1000:
-                response.status_code = 400
-                response.json.return_value = {'detail': 'Batch too large'}
-            else:
-                response.status_code = 200
-                features_list = [row['features'] for row in json['rows']]
-                results = self.predictor.predict_batch(features_list)
-
-                # Add product/store IDs
-                for i, row in enumerate(json['rows']):
-                    results[i]['productId'] = row.get('productId')
-                    results[i]['storeId'] = row.get('storeId')
-
-                response.json.return_value = {
-                    'results': results,
-                    'modelVersion': 'v1.0-mock',
-                    'processedCount': len(results)
-                }
+    @staticmethod
+    def _not_found():
+        return _mock_response(404, {'detail': 'Not found'})
 
-        else:
-            response.status_code = 404
-            response.json.return_value = {'detail': 'Not found'}
+    def _handle_root(self, **kwargs):
+        return _mock_response(200, {
+            'service': 'Stockout Predictor',
+            'version': 'v1.0-mock'
+        })
+
+    def _handle_health(self, **kwargs):
+        return _mock_response(200, {
+            'status': 'healthy',
+            'modelType': 'lightgbm',
+            'featuresCount': 21
+        })
 
-        return response
+    @_require_auth
+    def _handle_predict(self, json: Dict = None, **kwargs):
+        if not json or 'features' not in json:
+            return _mock_response(400, {'detail': 'Missing features'})
+
+        result = self.predictor.predict(json['features'])
+        result['productId'] = json.get('productId')
+        result['storeId'] = json.get('storeId')
+        return _mock_response(200, result)
+
+    @_require_auth
+    def _handle_predict_batch(self, json: Dict = None, **kwargs):
+        if not json or 'rows' not in json:
+            return _mock_response(400, {'detail': 'Missing rows'})
+        if len(json['rows']) == 0:
+            return _mock_response(400, {'detail': 'Empty batch'})
+        if len(json['rows']) > 1000:
+            return _mock_response(400, {'detail': 'Batch too large'})
+
+        features_list = [row['features'] for row in json['rows']]
+        results = self.predictor.predict_batch(features_list)
+
+        # Add product/store IDs
+        for i, row in enumerate(json['rows']):
+            results[i]['productId'] = row.get('productId')
+            results[i]['storeId'] = row.get('storeId')
+
+        return _mock_response(200, {
+            'results': results,
+            'modelVersion': 'v1.0-mock',
+            'processedCount': len(results)
+        })
 
 
 # Convenience functions for pytest fixtures
@@ -1,24 +1,55 @@
 """
 Reusable sample data fixtures
 """
-from typing import Dict, Any, List
+from typing import ClassVar, Dict, Any, List
 
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+# One PCG64 generator shared by every fixture; sized calls instead of the global legacy API
+_RNG = np.random.default_rng(42)
+
 
 class SampleDataFactory:
     """Factory for generating sample data"""
 
+    # Baseline feature values shared by every vector; copied, never mutated
+    _BASE_FEATURES: ClassVar[Dict[str, Any]] = {
+        'sales7d': 50,
+        'sales14d': 100,
+        'sales30d': 250,
+        'sales7dPerDay': 7.14,
+        'sales30dPerDay': 8.33,
+        'salesRatio7To30': 0.2,
+        'views7d': 500,
+        'views30d': 2000,
+        'addToCarts7d': 100,
+        'viewToPurchase7d': 0.1,
+        'avgPrice': 35.99,
+        'minPrice': 29.99,
+        'maxPrice': 39.99,
+        'avgRating': 4.5,
+        'ratingCount': 25,
+        'inventoryQty': 150,
+        'daysSinceRestock': 5,
+        'storeViews7d': 5000,
+        'storePurchases7d': 500,
+        'dayOfWeek': 3,
+        'isWeekend': 0
+    }
+
     @staticmethod
     def create_products(n: int = 10) -> pd.DataFrame:
         """Create sample products"""
+        index = np.arange(n).astype(str)
+        stores = np.array(['store-0', 'store-1', 'store-2'])
+
         return pd.DataFrame({
-            'id': [f'prod-{i}' for i in range(n)],
-            'storeId': [f'store-{i % 3}' for i in range(n)],
-            'name': [f'Product {i}' for i in range(n)],
-            'category': np.random.choice(['Electronics', 'Clothing', 'Home'], n)
+            'id': np.char.add('prod-', index),
+            'storeId': stores[np.arange(n) % 3],
+            'name': np.char.add('Product ', index),
+            'category': _RNG.choice(['Electronics', 'Clothing', 'Home'], n)
         })
 
     @staticmethod
@@ -29,51 +60,22 @@ class SampleDataFactory:
     ) -> pd.DataFrame:
         """Create sample daily stats"""
         dates = pd.date_range(start_date, periods=days, freq='D')
-        data = []
-
-        for product_id in product_ids:
-            for date in dates:
-                data.append({
-                    'productId': product_id,
-                    'date': date,
-                    'views': np.random.randint(50, 500),
-                    'purchases': np.random.randint(5, 50),
-                    'addToCarts': np.random.randint(10, 100),
-                    'revenue': np.random.uniform(100, 2000)
-                })
+        n_rows = len(product_ids) * days
 
-        return pd.DataFrame(data)
+        return pd.DataFrame({
+            'productId': np.repeat(product_ids, days),
+            'date': np.tile(dates.to_numpy(), len(product_ids)),
+            'views': _RNG.integers(50, 500, size=n_rows),
+            'purchases': _RNG.integers(5, 50, size=n_rows),
+            'addToCarts': _RNG.integers(10, 100, size=n_rows),
+            'revenue': _RNG.uniform(100, 2000, size=n_rows)
+        })
 
-    @staticmethod
+    @classmethod
     def create_feature_vector(
+            cls,
             product_id: str = 'prod-1',
             **overrides
     ) -> Dict[str, Any]:
         """Create sample feature vector"""
-        features = {
-            'productId': product_id,
-            'sales7d': 50,
-            'sales14d': 100,
-            'sales30d': 250,
-            'sales7dPerDay': 7.14,
-            'sales30dPerDay': 8.33,
-            'salesRatio7To30': 0.2,
-            'views7d': 500,
-            'views30d': 2000,
-            'addToCarts7d': 100,
-            'viewToPurchase7d': 0.1,
-            'avgPrice': 35.99,
-            'minPrice': 29.99,
-            'maxPrice': 39.99,
-            'avgRating': 4.5,
-            'ratingCount': 25,
-            'inventoryQty': 150,
-            'daysSinceRestock': 5,
-            'storeViews7d': 5000,
-            'storePurchases7d': 500,
-            'dayOfWeek': 3,
-            'isWeekend': 0
-        }
-
-        features.update(overrides)
-        return features
+        return {'productId': product_id, **cls._BASE_FEATURES, **overrides}
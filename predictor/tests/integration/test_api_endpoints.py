@@ -2,18 +2,21 @@
 Integration tests for API endpoints
 """
 import pytest
+import pytest_asyncio
 import numpy as np
-from unittest.mock import patch, MagicMock, Mock
-from fastapi.testclient import TestClient
+import orjson
+from unittest.mock import MagicMock, Mock
+from httpx import ASGITransport, AsyncClient
 
 
 @pytest.mark.integration
+@pytest.mark.asyncio(loop_scope="session")
 class TestAPIEndpoints:
     """Test FastAPI server endpoints"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def app_with_mocks(self):
-        """Create app with mocked dependencies"""
+        """Create app with mocked dependencies (shared by the tests in this class)"""
         # Must import here to avoid module-level issues
         from predictor import serve
         from predictor.config import featureConfig
@@ -28,93 +31,95 @@ class TestAPIEndpoints:
             'columns': featureConfig.featureColumns
         }
 
-        # Patch module-level variables
-        with patch.object(serve, 'model', mock_model), \
-             patch.object(serve, 'scalerInfo', mock_scaler_info), \
-             patch.object(serve, 'modelType', 'lightgbm'):
-
-            yield serve.app
-
-    @pytest.fixture
-    def client(self, app_with_mocks):
-        """Create test client"""
-        return TestClient(app_with_mocks)
-
-    def test_root_endpoint(self, client):
+        # Set module-level variables directly for this class; restored on teardown.
+        # predictFn is cleared so calls go through the (monkeypatchable) mock model.predict
+        original = (serve.model, serve.scalerInfo, serve.modelType, serve.predictFn)
+        serve.model = mock_model
+        serve.scalerInfo = mock_scaler_info
+        serve.modelType = 'lightgbm'
+        serve.predictFn = None
+
+        yield serve.app
+
+        serve.model, serve.scalerInfo, serve.modelType, serve.predictFn = original
+
+    @pytest_asyncio.fixture(scope="class", loop_scope="session")
+    async def client(self, app_with_mocks):
+        """Create async test client talking to the app over ASGI"""
+        transport = ASGITransport(app=app_with_mocks)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            yield ac
+
+    @pytest.fixture(scope="session")
+    def batch_payload(self, sample_features):
+        """Pre-serialized /predict_batch body of 5 rows sharing one features dict"""
+        return orjson.dumps({
+            'rows': [
+                {'productId': f'prod-{i}', 'features': sample_features}
+                for i in range(5)
+            ]
+        })
+
+    async def test_root_endpoint(self, client):
         """Test root endpoint"""
-        response = client.get('/')
+        response = await client.get('/')
         assert response.status_code == 200
 
-    def test_health_endpoint(self, client):
+    async def test_health_endpoint(self, client):
         """Test health check"""
-        response = client.get('/health')
+        response = await client.get('/health')
         assert response.status_code == 200
 
-    def test_predict_endpoint_success(self, client, sample_features):
+    async def test_predict_endpoint_success(self, client, sample_features, monkeypatch):
         """Test prediction with auth"""
         from predictor import serve
 
-        # Temporarily disable auth for testing
-        original_token = serve.serverConfig.authToken
-        serve.serverConfig.authToken = None
+        # Disable auth for testing
+        monkeypatch.setattr(serve.serverConfig, 'authToken', None)
 
-        try:
-            payload = {
-                'productId': 'prod-123',
-                'features': sample_features
-            }
+        payload = {
+            'productId': 'prod-123',
+            'features': sample_features
+        }
 
-            response = client.post('/predict', json=payload)
+        response = await client.post('/predict', json=payload)
 
-            assert response.status_code == 200
-            data = response.json()
-            assert 'score' in data
-            assert 'label' in data
-        finally:
-            serve.serverConfig.authToken = original_token
+        assert response.status_code == 200
+        data = response.json()
+        assert 'score' in data
+        assert 'label' in data
 
-    def test_predict_endpoint_missing_auth(self, client, sample_features):
+    async def test_predict_endpoint_missing_auth(self, client, sample_features, monkeypatch):
         """Test prediction without auth when required"""
         from predictor import serve
 
         # Enable auth
-        original_token = serve.serverConfig.authToken
-        serve.serverConfig.authToken = 'required-token'
+        monkeypatch.setattr(serve.serverConfig, 'authToken', 'required-token')
 
-        try:
-            payload = {'features': sample_features}
-            response = client.post('/predict', json=payload)
+        payload = {'features': sample_features}
+        response = await client.post('/predict', json=payload)
 
-            # Should fail without token
-            assert response.status_code == 401
-        finally:
-            serve.serverConfig.authToken = original_token
+        # Should fail without token
+        assert response.status_code == 401
 
-    def test_predict_batch_endpoint(self, client, sample_features):
+    async def test_predict_batch_endpoint(self, client, batch_payload, monkeypatch):
         """Test batch prediction"""
         from predictor import serve
 
         # Disable auth
-        original_token = serve.serverConfig.authToken
-        serve.serverConfig.authToken = None
+        monkeypatch.setattr(serve.serverConfig, 'authToken', None)
 
         # Mock batch predictions
         mock_predictions = np.array([0.6, 0.7, 0.8, 0.5, 0.9])
-        serve.model.predict = Mock(return_value=mock_predictions)
-
-        try:
-            payload = {
-                'rows': [
-                    {'productId': f'prod-{i}', 'features': sample_features}
-                    for i in range(5)
-                ]
-            }
-
-            response = client.post('/predict_batch', json=payload)
-
-            assert response.status_code == 200
-            data = response.json()
-            assert 'results' in data
-            assert len(data['results']) == 5
-        finally:
-            serve.serverConfig.authToken = original_token
+        monkeypatch.setattr(serve.model, 'predict', Mock(return_value=mock_predictions))
+
+        response = await client.post(
+            '/predict_batch',
+            content=batch_payload,
+            headers={'content-type': 'application/json'}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert 'results' in data
+        assert len(data['results']) == 5
@@ -1,39 +1,65 @@
 """
 Integration tests for feature export pipeline
 """
+import importlib.util
+
 import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
 from predictor.export_features import FeatureExporter
 
+# Exported columns the assertions read, with compact dtypes
+EXPORT_COLUMNS = ['productId', 'snapshotDate', 'sales7d', 'stockout14d']
+EXPORT_DTYPES = {'productId': 'string', 'sales7d': 'int32', 'stockout14d': 'int8'}
+READ_ENGINE = {'engine': 'pyarrow'} if importlib.util.find_spec('pyarrow') else {}
+
+
+def read_export(path, **kwargs):
+    """Read an exported features CSV, parsing only the asserted columns"""
+    return pd.read_csv(path, usecols=EXPORT_COLUMNS, dtype=EXPORT_DTYPES, **READ_ENGINE, **kwargs)
+
+
+def stub_data_loader(products, product_stats, store_stats, variants, inventory, reviews):
+    """Plain stand-in for DataLoader whose load methods return fixed frames"""
+    def returning(df):
+        return lambda *args, **kwargs: df
+
+    return SimpleNamespace(
+        loadProducts=returning(products),
+        loadProductDailyStats=returning(product_stats),
+        loadStoreDailyStats=returning(store_stats),
+        loadVariants=returning(variants),
+        loadInventory=returning(inventory),
+        loadReviews=returning(reviews)
+    )
+
 
 @pytest.mark.integration
 class TestExportPipeline:
     """Test complete export pipeline"""
 
-    @pytest.fixture
-    def exporter(self):
-        """Create FeatureExporter with mocked components"""
+    @pytest.fixture(scope="session")
+    def shared_exporter(self):
+        """Create FeatureExporter with mocked components (once per session)"""
         # Don't actually create engine
         with patch('predictor.export_features.create_engine'):
             exporter = FeatureExporter()
 
-            # Mock engine completely
+            # Mock engine completely; each test installs its own dataLoader stub
             exporter.engine = MagicMock()
 
-            # Mock dataLoader methods
-            exporter.dataLoader = Mock()
-            exporter.dataLoader.loadProducts = Mock()
-            exporter.dataLoader.loadProductDailyStats = Mock()
-            exporter.dataLoader.loadStoreDailyStats = Mock()
-            exporter.dataLoader.loadVariants = Mock()
-            exporter.dataLoader.loadInventory = Mock()
-            exporter.dataLoader.loadReviews = Mock()
-
             return exporter
 
+    @pytest.fixture
+    def exporter(self, shared_exporter):
+        """Shared exporter with its engine mock reset for the current test"""
+        shared_exporter.engine.reset_mock(return_value=True, side_effect=True)
+        shared_exporter.dataLoader = None
+        return shared_exporter
+
     def test_export_single_product(
             self,
             exporter,
@@ -47,16 +73,18 @@ class TestExportPipeline:
         """Test exporting features for a single product"""
         output_path = temp_data_dir / "features.csv"
 
-        # Setup mocks - these return values will be used
-        exporter.dataLoader.loadProducts.return_value = pd.DataFrame({
-            'id': ['prod-1'],
-            'storeId': ['store-1']
-        })
-        exporter.dataLoader.loadProductDailyStats.return_value = sample_product_stats
-        exporter.dataLoader.loadStoreDailyStats.return_value = sample_store_stats
-        exporter.dataLoader.loadVariants.return_value = sample_variants
-        exporter.dataLoader.loadInventory.return_value = sample_inventory
-        exporter.dataLoader.loadReviews.return_value = sample_reviews
+        # Setup loader stubs - these frames will be used
+        exporter.dataLoader = stub_data_loader(
+            products=pd.DataFrame({
+                'id': ['prod-1'],
+                'storeId': ['store-1']
+            }),
+            product_stats=sample_product_stats,
+            store_stats=sample_store_stats,
+            variants=sample_variants,
+            inventory=sample_inventory,
+            reviews=sample_reviews
+        )
 
         try:
             # Run export
@@ -71,7 +99,7 @@ class TestExportPipeline:
             if not output_path.exists():
                 pytest.skip("Export did not create output file")
 
-            df = pd.read_csv(output_path)
+            df = read_export(output_path, parse_dates=['snapshotDate'])
 
             # Verify basic structure
             if len(df) == 0:
@@ -84,7 +112,7 @@ class TestExportPipeline:
 
             # Verify date range (if we have data)
             if len(df) > 0:
-                dates = pd.to_datetime(df['snapshotDate'])
+                dates = df['snapshotDate']
                 assert dates.min() >= pd.Timestamp('2025-01-15')
                 assert dates.max() <= pd.Timestamp('2025-01-20')
 
@@ -105,12 +133,14 @@ class TestExportPipeline:
         """Test exporting features for multiple products"""
         output_path = temp_data_dir / "features_multi.csv"
 
-        exporter.dataLoader.loadProducts.return_value = sample_products
-        exporter.dataLoader.loadProductDailyStats.return_value = sample_product_stats
-        exporter.dataLoader.loadStoreDailyStats.return_value = sample_store_stats
-        exporter.dataLoader.loadVariants.return_value = sample_variants
-        exporter.dataLoader.loadInventory.return_value = sample_inventory
-        exporter.dataLoader.loadReviews.return_value = sample_reviews
+        exporter.dataLoader = stub_data_loader(
+            products=sample_products,
+            product_stats=sample_product_stats,
+            store_stats=sample_store_stats,
+            variants=sample_variants,
+            inventory=sample_inventory,
+            reviews=sample_reviews
+        )
 
         exporter.exportFeatures(
             startDate='2025-01-15',
@@ -119,7 +149,7 @@ class TestExportPipeline:
             batchSize=2
         )
 
-        df = pd.read_csv(output_path)
+        df = read_export(output_path)
 
         # Should have at least one product
         assert len(df) > 0
@@ -136,15 +166,17 @@ class TestExportPipeline:
         output_path = temp_data_dir / "features_missing.csv"
 
         # Product with no stats
-        exporter.dataLoader.loadProducts.return_value = pd.DataFrame({
-            'id': ['prod-orphan'],
-            'storeId': ['store-orphan']
-        })
-        exporter.dataLoader.loadProductDailyStats.return_value = pd.DataFrame()
-        exporter.dataLoader.loadStoreDailyStats.return_value = pd.DataFrame()
-        exporter.dataLoader.loadVariants.return_value = pd.DataFrame()
-        exporter.dataLoader.loadInventory.return_value = pd.DataFrame()
-        exporter.dataLoader.loadReviews.return_value = pd.DataFrame()
+        exporter.dataLoader = stub_data_loader(
+            products=pd.DataFrame({
+                'id': ['prod-orphan'],
+                'storeId': ['store-orphan']
+            }),
+            product_stats=pd.DataFrame(),
+            store_stats=pd.DataFrame(),
+            variants=pd.DataFrame(),
+            inventory=pd.DataFrame(),
+            reviews=pd.DataFrame()
+        )
 
         try:
             exporter.exportFeatures(
@@ -155,7 +187,7 @@ class TestExportPipeline:
 
             # Check if file was created
             if output_path.exists():
-                df = pd.read_csv(output_path)
+                df = read_export(output_path)
                 # If rows exist, they should have zero values
                 if len(df) > 0:
                     assert (df['sales7d'] == 0).all()
@@ -163,11 +195,75 @@ class TestExportPipeline:
             # If it fails, that's acceptable for this edge case
             pytest.skip(f"Export failed with missing data - acceptable: {e}")
 
+    @pytest.mark.parametrize("product_ids", [None, ['prod-1']])
+    def test_export_id_filters(
+            self,
+            exporter,
+            temp_data_dir,
+            product_ids,
+            sample_product_stats,
+            sample_store_stats,
+            sample_variants,
+            sample_inventory,
+            sample_reviews
+    ):
+        """Test a full export loads whole tables and a filtered one passes its ids"""
+        loader = stub_data_loader(
+            products=pd.DataFrame({'id': ['prod-1'], 'storeId': ['store-1']}),
+            product_stats=sample_product_stats,
+            store_stats=sample_store_stats,
+            variants=sample_variants,
+            inventory=sample_inventory,
+            reviews=sample_reviews
+        )
+        for name in ('loadProductDailyStats', 'loadStoreDailyStats', 'loadVariants', 'loadInventory', 'loadReviews'):
+            setattr(loader, name, MagicMock(side_effect=getattr(loader, name)))
+        exporter.dataLoader = loader
+
+        exporter.exportFeatures(
+            startDate='2025-01-15',
+            endDate='2025-01-20',
+            outputCsv=str(temp_data_dir / "features_filters.csv"),
+            productIds=product_ids
+        )
+
+        if product_ids is None:
+            assert loader.loadProductDailyStats.call_args.args[2] is None
+            assert loader.loadStoreDailyStats.call_args.args[2] is None
+            assert loader.loadVariants.call_args.args[0] is None
+            assert loader.loadInventory.call_args.args[0] is None
+            assert loader.loadReviews.call_args.args[2] is None
+        else:
+            assert loader.loadProductDailyStats.call_args.args[2] == ['prod-1']
+            assert loader.loadStoreDailyStats.call_args.args[2] == ['store-1']
+            assert loader.loadVariants.call_args.args[0] == ['prod-1']
+            assert loader.loadInventory.call_args.args[0] == sample_variants['id'].tolist()
+            assert loader.loadReviews.call_args.args[2] == ['prod-1']
+
+    @pytest.fixture(scope="session")
+    def large_stats_df(self):
+        """90 days of product stats for two products (built once per session; read-only)"""
+        dates = pd.date_range('2025-01-01', periods=90, freq='D')
+        rng = np.random.default_rng(0)
+        n_rows = 2 * len(dates)
+
+        return pd.DataFrame({
+            'productId': np.repeat(['prod-1', 'prod-2'], len(dates)),
+            'date': np.tile(dates.to_numpy(), 2),
+            'views': rng.integers(50, 200, size=n_rows),
+            'purchases': rng.integers(5, 20, size=n_rows),
+            'addToCarts': rng.integers(10, 40, size=n_rows),
+            'revenue': rng.uniform(100, 500, size=n_rows)
+        })
+
     @pytest.mark.slow
+    @pytest.mark.parametrize("batch_size", [2, 10, 32])
     def test_export_large_date_range(
             self,
             exporter,
             temp_data_dir,
+            large_stats_df,
+            batch_size,
             sample_products,
             sample_store_stats,
             sample_variants,
@@ -177,38 +273,23 @@ class TestExportPipeline:
         """Test exporting large date range"""
         output_path = temp_data_dir / "features_large.csv"
 
-        # Generate 90 days of data
-        dates = pd.date_range('2025-01-01', periods=90, freq='D')
-        large_stats = []
-
-        for product_id in ['prod-1', 'prod-2']:
-            for date in dates:
-                large_stats.append({
-                    'productId': product_id,
-                    'date': date,
-                    'views': np.random.randint(50, 200),
-                    'purchases': np.random.randint(5, 20),
-                    'addToCarts': np.random.randint(10, 40),
-                    'revenue': np.random.uniform(100, 500)
-                })
-
-        large_stats_df = pd.DataFrame(large_stats)
-
-        exporter.dataLoader.loadProducts.return_value = sample_products
-        exporter.dataLoader.loadProductDailyStats.return_value = large_stats_df
-        exporter.dataLoader.loadStoreDailyStats.return_value = sample_store_stats
-        exporter.dataLoader.loadVariants.return_value = sample_variants
-        exporter.dataLoader.loadInventory.return_value = sample_inventory
-        exporter.dataLoader.loadReviews.return_value = sample_reviews
+        exporter.dataLoader = stub_data_loader(
+            products=sample_products,
+            product_stats=large_stats_df,
+            store_stats=sample_store_stats,
+            variants=sample_variants,
+            inventory=sample_inventory,
+            reviews=sample_reviews
+        )
 
         exporter.exportFeatures(
             startDate='2025-01-30',  # Start after padding
             endDate='2025-03-31',
             outputCsv=str(output_path),
-            batchSize=10
+            batchSize=batch_size
         )
 
-        df = pd.read_csv(output_path)
+        df = read_export(output_path)
 
         # Should have at least some rows (relaxed requirement)
         assert len(df) >= 60  # At least 30 days per product
@@ -1,6 +1,8 @@
 """
 Integration tests for file-based feature export pipeline
 """
+import csv
+
 import pytest
 import pandas as pd
 from datetime import datetime, timedelta
@@ -17,9 +19,9 @@ class TestFileExportPipeline:
         """Create FileFeatureExporter instance"""
         return FileFeatureExporter()
 
-    @pytest.fixture
-    def sample_excel_file(self, tmp_path):
-        """Create a dummy Excel file for testing"""
+    @pytest.fixture(scope="session")
+    def sample_input_file(self, tmp_path_factory):
+        """Create a dummy Online Retail CSV for testing (written once per session)"""
         data = {
             'InvoiceNo': ['536365', '536365', '536366'],
             'StockCode': ['85123A', '71053', '22752'],
@@ -31,21 +33,21 @@ class TestFileExportPipeline:
             'Country': ['United Kingdom', 'United Kingdom', 'France']
         }
         df = pd.DataFrame(data)
-        file_path = tmp_path / "Online Retail.xlsx"
-        df.to_excel(file_path, index=False)
+        file_path = tmp_path_factory.mktemp('retail_input') / "Online Retail.csv"
+        df.to_csv(file_path, index=False)
         return str(file_path)
 
     def test_export_features_from_file(
             self,
             exporter,
             temp_data_dir,
-            sample_excel_file
+            sample_input_file
     ):
-        """Test exporting features from an Excel file"""
+        """Test exporting features from a retail transactions file"""
         output_path = temp_data_dir / "features_from_file.csv"
 
         exporter.exportFeatures(
-            inputFile=sample_excel_file,
+            inputFile=sample_input_file,
             outputCsv=str(output_path),
             batchSize=10
         )
@@ -53,11 +55,15 @@ class TestFileExportPipeline:
         # Verify output exists
         assert output_path.exists()
 
-        df = pd.read_csv(output_path)
+        # Header plus one data row is all the structure checks need
+        with open(output_path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            first_row = next(reader, None)
 
         # Verify basic structure
-        assert len(df) > 0
-        assert 'productId' in df.columns
-        assert 'snapshotDate' in df.columns
-        assert 'sales7d' in df.columns
-        assert 'stockout14d' in df.columns
+        assert first_row is not None
+        assert 'productId' in header
+        assert 'snapshotDate' in header
+        assert 'sales7d' in header
+        assert 'stockout14d' in header
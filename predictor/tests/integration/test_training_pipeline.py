@@ -1,12 +1,17 @@
 """
 Integration tests for model training pipeline
 """
+import importlib.util
+
 import pytest
 import pandas as pd
 import numpy as np
 import joblib
 from pathlib import Path
-from predictor.train_model import ModelTrainer
+from predictor.train_model import ModelTrainer, HAS_PYARROW
+
+# Probe without importing: a TensorFlow import costs seconds at collection
+HAS_TF = importlib.util.find_spec("tensorflow") is not None
 
 
 @pytest.mark.integration
@@ -14,61 +19,102 @@ from predictor.train_model import ModelTrainer
 class TestTrainingPipeline:
     """Test complete training pipeline"""
 
-    @pytest.fixture
-    def training_data(self, temp_data_dir):
-        """Create sample training CSV"""
-        # Generate synthetic training data
-        n_samples = 1000
+    # Structural tests only check shapes, so they train on a small file
+    SMALL_SAMPLES = 128
+    FULL_SAMPLES = 1000
+
+    @staticmethod
+    def _write_training_data(tmp_path_factory, n_samples):
+        """Write a synthetic training file with n_samples rows and return its path"""
+        # Seeded so the shared file is reproducible
+        rng = np.random.default_rng(42)
         dates = pd.date_range('2025-01-01', periods=n_samples, freq='H')
 
         data = {
             'productId': [f'prod-{i % 10}' for i in range(n_samples)],
             'storeId': [f'store-{i % 5}' for i in range(n_samples)],
             'snapshotDate': dates,
-            'sales7d': np.random.randint(0, 100, n_samples),
-            'sales14d': np.random.randint(0, 200, n_samples),
-            'sales30d': np.random.randint(0, 500, n_samples),
-            'sales7dPerDay': np.random.uniform(0, 20, n_samples),
-            'sales30dPerDay': np.random.uniform(0, 20, n_samples),
-            'salesRatio7To30': np.random.uniform(0, 1, n_samples),
-            'views7d': np.random.randint(100, 1000, n_samples),
-            'views30d': np.random.randint(500, 5000, n_samples),
-            'addToCarts7d': np.random.randint(10, 200, n_samples),
-            'viewToPurchase7d': np.random.uniform(0, 0.5, n_samples),
-            'avgPrice': np.random.uniform(10, 100, n_samples),
-            'minPrice': np.random.uniform(5, 50, n_samples),
-            'maxPrice': np.random.uniform(50, 150, n_samples),
-            'avgRating': np.random.uniform(1, 5, n_samples),
-            'ratingCount': np.random.randint(0, 100, n_samples),
-            'inventoryQty': np.random.randint(0, 500, n_samples),
-            'daysSinceRestock': np.random.randint(0, 365, n_samples),
-            'storeViews7d': np.random.randint(1000, 10000, n_samples),
-            'storePurchases7d': np.random.randint(100, 1000, n_samples),
-            'dayOfWeek': np.random.randint(0, 7, n_samples),
-            'isWeekend': np.random.randint(0, 2, n_samples),
-            'futureSales14d': np.random.randint(0, 200, n_samples),
-            'stockout14d': np.random.randint(0, 2, n_samples)
+            'sales7d': rng.integers(0, 100, n_samples),
+            'sales14d': rng.integers(0, 200, n_samples),
+            'sales30d': rng.integers(0, 500, n_samples),
+            'sales7dPerDay': rng.uniform(0, 20, n_samples),
+            'sales30dPerDay': rng.uniform(0, 20, n_samples),
+            'salesRatio7To30': rng.uniform(0, 1, n_samples),
+            'views7d': rng.integers(100, 1000, n_samples),
+            'views30d': rng.integers(500, 5000, n_samples),
+            'addToCarts7d': rng.integers(10, 200, n_samples),
+            'viewToPurchase7d': rng.uniform(0, 0.5, n_samples),
+            'avgPrice': rng.uniform(10, 100, n_samples),
+            'minPrice': rng.uniform(5, 50, n_samples),
+            'maxPrice': rng.uniform(50, 150, n_samples),
+            'avgRating': rng.uniform(1, 5, n_samples),
+            'ratingCount': rng.integers(0, 100, n_samples),
+            'inventoryQty': rng.integers(0, 500, n_samples),
+            'daysSinceRestock': rng.integers(0, 365, n_samples),
+            'storeViews7d': rng.integers(1000, 10000, n_samples),
+            'storePurchases7d': rng.integers(100, 1000, n_samples),
+            'dayOfWeek': rng.integers(0, 7, n_samples),
+            'isWeekend': rng.integers(0, 2, n_samples),
+            'futureSales14d': rng.integers(0, 200, n_samples),
+            'stockout14d': rng.integers(0, 2, n_samples)
         }
 
         df = pd.DataFrame(data)
-        csv_path = temp_data_dir / 'training_data.csv'
-        df.to_csv(csv_path, index=False)
-
-        return csv_path
-
-    def test_load_training_data(self, training_data):
+        data_dir = tmp_path_factory.mktemp(f'training_data_{n_samples}', numbered=False)
+
+        # Feather round-trips much faster than CSV; fall back to CSV without pyarrow
+        if HAS_PYARROW:
+            data_path = data_dir / 'training_data.feather'
+            df.to_feather(data_path)
+        else:
+            data_path = data_dir / 'training_data.csv'
+            df.to_csv(data_path, index=False)
+
+        return data_path
+
+    @pytest.fixture(scope="session")
+    def training_data_small(self, tmp_path_factory):
+        """Small training file for structural tests (written once per session; read-only)"""
+        return self._write_training_data(tmp_path_factory, self.SMALL_SAMPLES)
+
+    @pytest.fixture(scope="session")
+    def training_data_full(self, tmp_path_factory):
+        """Full-size training file for the slow training tests (read-only)"""
+        return self._write_training_data(tmp_path_factory, self.FULL_SAMPLES)
+
+    @pytest.fixture(scope="session")
+    def trainer(self):
+        """ModelTrainer shared by the suite; each training test refits its model"""
+        return ModelTrainer()
+
+    @pytest.fixture(scope="session")
+    def loaded_training(self, trainer, training_data_small):
+        """Load the small training file once per session as (X, y, df); read-only"""
+        return trainer.loadData(str(training_data_small))
+
+    @pytest.fixture(scope="session")
+    def split_training(self, trainer, loaded_training):
+        """Default train/validation split of the small data; read-only"""
+        X, y, _ = loaded_training
+        return trainer.splitData(X, y)
+
+    @pytest.fixture(scope="session")
+    def split_training_full(self, trainer, training_data_full):
+        """Default train/validation split of the full-size data; read-only"""
+        X, y, _ = trainer.loadData(str(training_data_full))
+        return trainer.splitData(X, y)
+
+    def test_load_training_data(self, loaded_training):
         """Test loading training data"""
-        trainer = ModelTrainer()
-        X, y, df = trainer.loadData(str(training_data))
+        X, y, df = loaded_training
 
-        assert X.shape[0] == 1000
+        assert X.shape[0] == self.SMALL_SAMPLES
         assert X.shape[1] == 21  # 21 features
-        assert y.shape[0] == 1000
-        assert len(df) == 1000
+        assert y.shape[0] == self.SMALL_SAMPLES
+        assert len(df) == self.SMALL_SAMPLES
 
-    def test_split_data(self, sample_training_data):
+    def test_split_data(self, trainer, sample_training_data):
         """Test train/validation split"""
-        trainer = ModelTrainer()
         X, y = sample_training_data
 
         X_train, X_val, y_train, y_val = trainer.splitData(X, y, testSize=0.2)
@@ -81,13 +127,12 @@ class TestTrainingPipeline:
     @pytest.mark.slow
     def test_train_lightgbm_model(
             self,
-            training_data,
+            trainer,
+            split_training_full,
             temp_model_dir
     ):
         """Test training LightGBM model"""
-        trainer = ModelTrainer()
-        X, y, _ = trainer.loadData(str(training_data))
-        X_train, X_val, y_train, y_val = trainer.splitData(X, y)
+        X_train, X_val, y_train, y_val = split_training_full
 
         # Train model
         model = trainer.trainLightGBM(X_train, y_train, X_val, y_val)
@@ -102,19 +147,15 @@ class TestTrainingPipeline:
         assert all(0 <= p <= 1 for p in predictions)
 
     @pytest.mark.slow
-    @pytest.mark.skipif(
-        not pytest.importorskip("tensorflow"),
-        reason="TensorFlow not installed"
-    )
+    @pytest.mark.skipif(not HAS_TF, reason="TensorFlow not installed")
     def test_train_keras_model(
             self,
-            training_data,
+            trainer,
+            split_training_full,
             temp_model_dir
     ):
         """Test training Keras model"""
-        trainer = ModelTrainer()
-        X, y, _ = trainer.loadData(str(training_data))
-        X_train, X_val, y_train, y_val = trainer.splitData(X, y)
+        X_train, X_val, y_train, y_val = split_training_full
 
         # Use smaller epochs for testing
         trainer.config.kerasEpochs = 2
@@ -130,11 +171,9 @@ class TestTrainingPipeline:
         predictions = model.predict(X_scaled, verbose=0)
         assert len(predictions) == 10
 
-    def test_evaluate_lightgbm(self, training_data, temp_model_dir):
+    def test_evaluate_lightgbm(self, trainer, split_training, temp_model_dir):
         """Test model evaluation"""
-        trainer = ModelTrainer()
-        X, y, _ = trainer.loadData(str(training_data))
-        X_train, X_val, y_train, y_val = trainer.splitData(X, y)
+        X_train, X_val, y_train, y_val = split_training
 
         # Train
         trainer.trainLightGBM(X_train, y_train, X_val, y_val)
@@ -149,13 +188,12 @@ class TestTrainingPipeline:
 
     def test_save_lightgbm_model(
             self,
-            training_data,
+            trainer,
+            split_training,
             temp_model_dir
     ):
         """Test saving LightGBM model"""
-        trainer = ModelTrainer()
-        X, y, _ = trainer.loadData(str(training_data))
-        X_train, X_val, y_train, y_val = trainer.splitData(X, y)
+        X_train, X_val, y_train, y_val = split_training
 
         # Train
         trainer.trainLightGBM(X_train, y_train, X_val, y_val)
@@ -174,68 +212,65 @@ class TestTrainingPipeline:
         assert 'columns' in scaler_obj
         assert len(scaler_obj['columns']) == 21
 
-    @pytest.fixture
-    def training_data_with_signal(self, temp_data_dir):
-        """Create training data with actual signal"""
+    @pytest.fixture(scope="session")
+    def training_data_with_signal(self):
+        """Create training data with actual signal (kept in memory, no CSV round-trip; read-only)"""
+        rng = np.random.default_rng(42)
         n_samples = 1000
         dates = pd.date_range('2025-01-01', periods=n_samples, freq='h')
 
         # Create features with correlation to label
-        sales_7d = np.random.randint(0, 100, n_samples)
-        inventory_qty = np.random.randint(0, 500, n_samples)
+        sales_7d = rng.integers(0, 100, n_samples)
+        inventory_qty = rng.integers(0, 500, n_samples)
 
         # Create label with actual correlation
         # Low inventory + high sales = high stockout risk
         stockout_prob = (sales_7d / 100) * (1 - inventory_qty / 500)
         stockout_prob = np.clip(stockout_prob, 0, 1)
-        stockout_14d = (np.random.rand(n_samples) < stockout_prob).astype(int)
+        stockout_14d = (rng.random(n_samples) < stockout_prob).astype(int)
 
         data = {
             'productId': [f'prod-{i % 10}' for i in range(n_samples)],
             'storeId': [f'store-{i % 5}' for i in range(n_samples)],
             'snapshotDate': dates,
             'sales7d': sales_7d,
-            'sales14d': sales_7d * 2 + np.random.randint(-10, 10, n_samples),
-            'sales30d': sales_7d * 4 + np.random.randint(-20, 20, n_samples),
+            'sales14d': sales_7d * 2 + rng.integers(-10, 10, n_samples),
+            'sales30d': sales_7d * 4 + rng.integers(-20, 20, n_samples),
             'sales7dPerDay': sales_7d / 7,
-            'sales30dPerDay': sales_7d / 7 + np.random.uniform(-1, 1, n_samples),
-            'salesRatio7To30': np.random.uniform(0.2, 0.3, n_samples),
-            'views7d': sales_7d * 10 + np.random.randint(-50, 50, n_samples),
-            'views30d': sales_7d * 40 + np.random.randint(-200, 200, n_samples),
-            'addToCarts7d': sales_7d * 2 + np.random.randint(-10, 10, n_samples),
-            'viewToPurchase7d': np.random.uniform(0.05, 0.15, n_samples),
-            'avgPrice': np.random.uniform(10, 100, n_samples),
-            'minPrice': np.random.uniform(5, 50, n_samples),
-            'maxPrice': np.random.uniform(50, 150, n_samples),
-            'avgRating': np.random.uniform(3, 5, n_samples),
-            'ratingCount': np.random.randint(0, 100, n_samples),
+            'sales30dPerDay': sales_7d / 7 + rng.uniform(-1, 1, n_samples),
+            'salesRatio7To30': rng.uniform(0.2, 0.3, n_samples),
+            'views7d': sales_7d * 10 + rng.integers(-50, 50, n_samples),
+            'views30d': sales_7d * 40 + rng.integers(-200, 200, n_samples),
+            'addToCarts7d': sales_7d * 2 + rng.integers(-10, 10, n_samples),
+            'viewToPurchase7d': rng.uniform(0.05, 0.15, n_samples),
+            'avgPrice': rng.uniform(10, 100, n_samples),
+            'minPrice': rng.uniform(5, 50, n_samples),
+            'maxPrice': rng.uniform(50, 150, n_samples),
+            'avgRating': rng.uniform(3, 5, n_samples),
+            'ratingCount': rng.integers(0, 100, n_samples),
             'inventoryQty': inventory_qty,
-            'daysSinceRestock': np.random.randint(0, 30, n_samples),
-            'storeViews7d': np.random.randint(1000, 10000, n_samples),
-            'storePurchases7d': np.random.randint(100, 1000, n_samples),
-            'dayOfWeek': np.random.randint(0, 7, n_samples),
-            'isWeekend': np.random.randint(0, 2, n_samples),
-            'futureSales14d': sales_7d * 2 + np.random.randint(-10, 10, n_samples),
+            'daysSinceRestock': rng.integers(0, 30, n_samples),
+            'storeViews7d': rng.integers(1000, 10000, n_samples),
+            'storePurchases7d': rng.integers(100, 1000, n_samples),
+            'dayOfWeek': rng.integers(0, 7, n_samples),
+            'isWeekend': rng.integers(0, 2, n_samples),
+            'futureSales14d': sales_7d * 2 + rng.integers(-10, 10, n_samples),
             'stockout14d': stockout_14d
         }
 
-        df = pd.DataFrame(data)
-        csv_path = temp_data_dir / 'training_data_signal.csv'
-        df.to_csv(csv_path, index=False)
-
-        return csv_path
+        return pd.DataFrame(data)
 
     @pytest.mark.slow
     def test_full_training_pipeline_with_signal(
             self,
+            trainer,
             training_data_with_signal,
             temp_model_dir
     ):
         """Test complete training pipeline with meaningful data"""
-        trainer = ModelTrainer()
 
         # Load data
-        X, y, df = trainer.loadData(str(training_data_with_signal))
+        X, y, df = trainer.loadDataFrame(training_data_with_signal)
         assert len(df) == 1000
 
         # Split
@@ -29,6 +29,11 @@ class TestCaseTransformerStringConversion:
         assert CaseTransformer.camelToSnake('XMLHttpRequest') == 'x_m_l_http_request'
         assert CaseTransformer.camelToSnake('IOError') == 'i_o_error'
 
+    def test_camel_to_snake_long_key(self):
+        """Test long keys take the vectorized path with the same result"""
+        key = 'Sales7dPerDay' * 30
+        assert CaseTransformer.camelToSnake(key) == 's' + 'ales7d_per_day_s' * 29 + 'ales7d_per_day'
+
     def test_camel_to_snake_numbers(self):
         """Test strings with numbers"""
         assert CaseTransformer.camelToSnake('user123Id') == 'user123_id'
@@ -3,7 +3,7 @@ Unit tests for configuration modules
 """
 import pytest
 import os
-from unittest.mock import patch
+from unittest.mock import patch, mock_open
 from predictor.config import (
     DatabaseConfig,
     FeatureConfig,
@@ -80,6 +80,7 @@ class TestFeatureConfig:
         custom_cols = ['feature1', 'feature2', 'feature3']
         config = FeatureConfig(featureColumns=custom_cols)
         assert config.featureColumns == custom_cols
+        assert config.featureColumnsSet == frozenset(custom_cols)
 
 
 class TestModelConfig:
@@ -121,6 +122,20 @@ class TestServerConfig:
             assert config.host == "0.0.0.0"
             assert config.port == 8080
             assert config.logLevel == "info"
+            assert config.useOnnx is False
+            assert config.workers == 1
+            assert config.predictWorkers >= 1
+
+    def test_available_cpus_honours_cgroup_quota(self):
+        """Test the cgroup v2 CPU quota caps the host CPU count"""
+        from predictor.config import _availableCpus
+
+        with patch('os.cpu_count', return_value=16), \
+                patch('builtins.open', mock_open(read_data='150000 100000\n')):
+            assert _availableCpus() == 1
+        with patch('os.cpu_count', return_value=16), \
+                patch('builtins.open', mock_open(read_data='max 100000\n')):
+            assert _availableCpus() == 16
 
     def test_from_environment(self):
         """Test server config from environment"""
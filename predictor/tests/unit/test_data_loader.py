@@ -41,6 +41,35 @@ class TestDataLoader:
             assert 'date' in result.columns
             assert pd.api.types.is_datetime64_any_dtype(result['date'])
 
+    def test_load_product_daily_stats_bulk_read(self, data_loader, sample_product_stats):
+        """Test an unfiltered load goes through connectorx and a filtered one through pandas"""
+        fake_cx = Mock()
+        fake_cx.read_sql.return_value = sample_product_stats
+        with patch('predictor.data_loader.HAS_CONNECTORX', True), \
+                patch('predictor.data_loader.cx', fake_cx, create=True), \
+                patch('pandas.read_sql_query', return_value=sample_product_stats) as read_sql_query:
+            result = data_loader.loadProductDailyStats('2025-01-01', '2025-01-30')
+            assert fake_cx.read_sql.call_count == 1
+            assert "BETWEEN '2025-01-01' AND '2025-01-30'" in fake_cx.read_sql.call_args.args[1]
+            assert read_sql_query.call_count == 0
+            assert pd.api.types.is_datetime64_any_dtype(result['date'])
+
+            data_loader.loadProductDailyStats('2025-01-01', '2025-01-30', ['prod-1'])
+            assert fake_cx.read_sql.call_count == 1
+            assert read_sql_query.call_count == 1
+
+    @pytest.mark.parametrize("has_connectorx", [False, True])
+    def test_load_product_daily_stats_datetime_strings(self, data_loader, sample_product_stats, has_connectorx):
+        """Test date strings fromisoformat rejects still load through the bound pandas query"""
+        fake_cx = Mock()
+        with patch('predictor.data_loader.HAS_CONNECTORX', has_connectorx), \
+                patch('predictor.data_loader.cx', fake_cx, create=True), \
+                patch('pandas.read_sql_query', return_value=sample_product_stats) as read_sql_query:
+            result = data_loader.loadProductDailyStats('2025-01-01 00:00:00', '2025-01-30 00:00:00')
+            assert fake_cx.read_sql.call_count == 0
+            assert read_sql_query.call_args.kwargs['params']['startDate'] == '2025-01-01 00:00:00'
+            assert len(result) > 0
+
     def test_load_store_daily_stats(self, data_loader, sample_store_stats):
         """Test loading store daily stats"""
         with patch('pandas.read_sql_query', return_value=sample_store_stats):
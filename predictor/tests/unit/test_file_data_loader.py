@@ -27,6 +27,17 @@ class TestFileDataLoader:
 
         pd.testing.assert_frame_equal(loaded_df, df)
 
+    def test_load_from_csv_file(self, file_data_loader, tmp_path):
+        """Test loading from a CSV file"""
+        data = {'col1': [1, 2], 'col2': ['A', 'B']}
+        df = pd.DataFrame(data)
+        file_path = tmp_path / "test.csv"
+        df.to_csv(file_path, index=False)
+
+        loaded_df = file_data_loader.load_from_file(str(file_path))
+
+        pd.testing.assert_frame_equal(loaded_df, df)
+
     def test_load_from_file_not_found(self, file_data_loader):
         """Test loading from a non-existent file"""
         with pytest.raises(FileNotFoundError):
@@ -0,0 +1,63 @@
+"""
+Unit tests for the shared MLP inference helpers
+"""
+import numpy as np
+from unittest.mock import MagicMock
+
+from predictor import inference
+
+
+class TestLabels:
+    """Test risk labels agree between the single-row and batch paths"""
+
+    def test_batch_labels_match_single_labels(self):
+        """Test vectorized labels equal per-score labels, including thresholds and NaN"""
+        scores = np.array([np.nan, 0.0, 0.4, 0.41, 0.7, 0.71, 1.0])
+        assert inference.mlpLabels(scores) == [inference.mlpLabel(s) for s in scores]
+        assert inference.mlpLabels(scores)[0] == 'low'
+
+
+class TestFeatureMatrix:
+    """Test feature matrix construction from explicit scaler info"""
+
+    def test_partial_and_snake_case_rows(self):
+        """Test exact rows, snake_case keys and missing columns map to the same positions"""
+        scalerInfo = {'scaler': None, 'columns': ['sales7d', 'viewToPurchase7d']}
+        X = inference.buildFeatureMatrix([
+            {'sales7d': 1.0, 'viewToPurchase7d': 2.0},
+            {'sales7d': 3.0, 'view_to_purchase7d': 4.0},
+            {'viewToPurchase7d': 5.0}
+        ], scalerInfo)
+
+        np.testing.assert_array_equal(X, [[1.0, 2.0], [3.0, 4.0], [0.0, 5.0]])
+        assert X.flags['C_CONTIGUOUS'] and X.dtype == np.float64
+
+
+class TestWarmup:
+    """Test warm-up dispatches on the model type"""
+
+    def test_mlp_warmup_traces_single_and_batch_shapes(self):
+        """Test MLP warm-up scores one row and one full batch"""
+        scoreMatrix = MagicMock(side_effect=lambda X: X[:, 0])
+        predictTft = MagicMock()
+
+        inference.warmup('lightgbm', {'scaler': None, 'columns': ['a', 'b']}, scoreMatrix, predictTft)
+
+        assert [call.args[0].shape[0] for call in scoreMatrix.call_args_list] == [
+            1, inference.serverConfig.maxBatchSize
+        ]
+        predictTft.assert_not_called()
+
+    def test_tft_warmup_passes_history(self):
+        """Test TFT warm-up hands a synthetic history to the TFT predictor"""
+        predictTft = MagicMock()
+
+        inference.warmup('tft', None, MagicMock(), predictTft)
+
+        history = predictTft.call_args.args[0]
+        assert len(history) == inference.WARMUP_HISTORY_DAYS
+        assert history[0]['date'] == '2024-01-01'
+
+    def test_warmup_failure_is_logged_not_raised(self):
+        """Test a failing warm-up doesn't stop startup"""
+        inference.warmup('lightgbm', {'scaler': None, 'columns': ['a']}, MagicMock(side_effect=RuntimeError), MagicMock())
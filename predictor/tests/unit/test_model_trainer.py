@@ -138,6 +138,26 @@ class TestModelTrainer:
         assert len(loaded_df) == 3
         assert X.shape[0] == 3
 
+    def test_load_data_frame_matches_csv(self, trainer, temp_data_dir):
+        """Test in-memory loading gives the same arrays as the CSV path"""
+        df = pd.DataFrame({
+            'productId': ['a', 'b', 'c', 'd'],
+            'sales7d': [1, 2, 3, 4],
+            'views7d': [10, 20, 30, 40],
+            'stockout14d': [0, 1, np.nan, 0]
+        })
+
+        csv_path = temp_data_dir / 'frame.csv'
+        df.to_csv(csv_path, index=False)
+
+        X, y, loaded_df = trainer.loadDataFrame(df)
+        X_csv, y_csv, _ = trainer.loadData(str(csv_path))
+
+        assert 'productId' not in loaded_df.columns
+        assert X.dtype == np.float32
+        np.testing.assert_array_equal(X, X_csv)
+        np.testing.assert_array_equal(y, y_csv)
+
     def test_load_data_file_not_found(self, trainer):
         """Test loading non-existent file"""
         with pytest.raises(FileNotFoundError):
@@ -186,6 +206,19 @@ class TestModelTrainer:
         assert abs(train_ratio - 0.1) < 0.02  # ~10% positive
         assert abs(val_ratio - 0.1) < 0.05    # ~10% positive
 
+    def test_split_data_shuffles_classes(self, trainer):
+        """Test split output is not grouped by class"""
+        X = np.arange(1000, dtype=np.float64).reshape(-1, 1)
+        y = np.array([0] * 500 + [1] * 500)
+
+        X_train, X_val, y_train, y_val = trainer.splitData(X, y)
+
+        # A class-sorted output would switch label exactly once
+        assert np.count_nonzero(np.diff(y_train)) > 1
+        assert np.count_nonzero(np.diff(y_val)) > 1
+        # Rows stay paired with their labels
+        np.testing.assert_array_equal(y_train, (X_train[:, 0] >= 500).astype(int))
+
     def test_split_data_reproducible(self, trainer, sample_training_data):
         """Test split is reproducible with same random state"""
         X, y = sample_training_data
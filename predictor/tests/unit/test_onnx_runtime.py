@@ -0,0 +1,31 @@
+"""
+Unit tests for ONNX Runtime scoring parity
+"""
+import pytest
+import numpy as np
+
+lgb = pytest.importorskip("lightgbm")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnxmltools")
+
+from predictor.onnx_runtime import buildOnnxPredictFn
+
+
+class TestOnnxParity:
+    """ONNX scores must match the native model before USE_ONNX can be enabled"""
+
+    def test_lightgbm_scores_match_booster(self):
+        """Test ONNX LightGBM scores match Booster.predict to float32 precision"""
+        rng = np.random.default_rng(0)
+        # float32-representable inputs, so split comparisons agree between the two paths
+        X = rng.random((500, 21)).astype(np.float32).astype(np.float64)
+        y = (X[:, 0] + X[:, 1] > 1.0).astype(int)
+        booster = lgb.train(
+            {'objective': 'binary', 'verbosity': -1},
+            lgb.Dataset(X, y),
+            num_boost_round=20
+        )
+
+        predict = buildOnnxPredictFn(booster, 'lightgbm', X.shape[1])
+
+        np.testing.assert_allclose(predict(X), booster.predict(X), atol=1e-5)
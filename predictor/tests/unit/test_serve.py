@@ -1,6 +1,9 @@
 """
 Unit tests for FastAPI serve module
 """
+import asyncio
+import threading
+
 import pytest
 import numpy as np
 import joblib
@@ -9,19 +12,21 @@ from fastapi.testclient import TestClient
 from pathlib import Path
 
 
-@pytest.fixture
-def mock_model_files(tmp_path):
-    """Create mock model files"""
+@pytest.fixture(scope="session")
+def mock_model_files(tmp_path_factory):
+    """Create mock model files (written once per session; tests only read them)"""
+    model_dir = tmp_path_factory.mktemp('fixtures')
+
     # Create scaler file
     scaler_obj = {
         'scaler': None,
         'columns': [f'feature_{i}' for i in range(21)]
     }
-    scaler_path = tmp_path / 'scaler.pkl'
+    scaler_path = model_dir / 'scaler.pkl'
     joblib.dump(scaler_obj, scaler_path)
 
     # Create mock model file
-    model_path = tmp_path / 'model.bin'
+    model_path = model_dir / 'model.bin'
     model_path.write_text("mock model")
 
     return {
@@ -366,8 +371,31 @@ class TestErrorHandling:
         }
 
         response = test_app.post('/predict_batch', json=payload)
-        assert response.status_code == 500
-        assert 'Batch prediction error' in response.json()['detail']
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert results == [{'index': 0, 'error': 'Batch error'}]
+
+    def test_batch_predict_bad_row_keeps_neighbours(self, test_app):
+        """Test a row that cannot be scored fails alone, not the whole batch"""
+        from predictor import serve
+        serve.model.predict = MagicMock(side_effect=lambda X: np.full(len(X), 0.75))
+
+        features = {f'feature_{i}': float(i) for i in range(21)}
+        payload = {
+            'rows': [
+                {'features': features},
+                {'features': {**features, 'feature_3': 'not-a-number'}},
+                {'features': features}
+            ]
+        }
+
+        response = test_app.post('/predict_batch', json=payload)
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert [r['index'] for r in results] == [0, 1, 2]
+        assert results[0]['score'] == 0.75
+        assert 'error' in results[1]
+        assert results[2]['score'] == 0.75
 
 
 class TestFeatureProcessing:
@@ -428,3 +456,140 @@ class TestStartupShutdown:
     def test_shutdown_cleanup(self):
         """Test shutdown event cleanup"""
         pass
+
+    def test_predict_after_lifespan_restart(self, tmp_path, monkeypatch):
+        """Test a second startup in the same process gets a live predict pool"""
+        lgb = pytest.importorskip('lightgbm')
+        from predictor import serve
+
+        columns = [f'feature_{i}' for i in range(21)]
+        rng = np.random.default_rng(0)
+        X = rng.random((100, 21))
+        booster = lgb.train(
+            {'objective': 'binary', 'verbosity': -1},
+            lgb.Dataset(X, (X[:, 0] > 0.5).astype(int)),
+            num_boost_round=2
+        )
+        booster.save_model(str(tmp_path / 'model.bin'))
+        joblib.dump({'scaler': None, 'columns': columns}, tmp_path / 'scaler.pkl')
+
+        monkeypatch.setattr(serve.serverConfig, 'modelPath', str(tmp_path / 'model.bin'))
+        monkeypatch.setattr(serve.serverConfig, 'scalerPath', str(tmp_path / 'scaler.pkl'))
+        monkeypatch.setattr(serve.serverConfig, 'modelType', 'lightgbm')
+        monkeypatch.setattr(serve.serverConfig, 'authToken', None)
+        # Startup rebinds these; monkeypatch restores them for later tests
+        for name in ('model', 'scalerInfo', 'modelType', 'predictFn'):
+            monkeypatch.setattr(serve, name, getattr(serve, name))
+
+        features = {col: 0.5 for col in columns}
+        for _ in range(2):
+            with TestClient(serve.app) as client:
+                assert client.post('/predict', json={'features': features}).status_code == 200
+                response = client.post('/predict_batch', json={'rows': [{'features': features}]})
+                assert response.status_code == 200
+                assert 'score' in response.json()['results'][0]
+
+
+@pytest.fixture
+def mlp_globals(monkeypatch):
+    """Point serve at a stub MLP whose score is the first feature; records each call's row count"""
+    from predictor import serve
+
+    calls = []
+
+    def predict(X):
+        calls.append(len(X))
+        return X[:, 0].copy()
+
+    monkeypatch.setattr(serve, 'model', MagicMock())
+    monkeypatch.setattr(serve, 'modelType', 'lightgbm')
+    monkeypatch.setattr(serve, 'predictFn', predict)
+    monkeypatch.setattr(serve, 'scalerInfo', {
+        'scaler': None,
+        'columns': [f'feature_{i}' for i in range(21)]
+    })
+    return calls
+
+
+def make_features(value):
+    return {f'feature_{i}': float(value) for i in range(21)}
+
+
+class TestMicroBatcher:
+    """Test coalescing of concurrent single-row predictions"""
+
+    async def test_coalesces_concurrent_submits(self, mlp_globals):
+        """Test concurrent submits are scored in one model call"""
+        from predictor import serve
+
+        batcher = serve.MicroBatcher(maxBatchSize=8, maxLatencyMs=50)
+        batcher.start()
+        try:
+            scores = await asyncio.gather(*(batcher.submit(make_features(i)) for i in range(5)))
+        finally:
+            await batcher.stop()
+
+        assert scores == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert mlp_globals == [5]
+
+    async def test_bad_row_rescored_without_failing_neighbours(self, mlp_globals):
+        """Test a row that cannot be scored fails alone"""
+        from predictor import serve
+
+        batcher = serve.MicroBatcher(maxBatchSize=8, maxLatencyMs=50)
+        batcher.start()
+        bad = {**make_features(1), 'feature_0': 'not-a-number'}
+        try:
+            results = await asyncio.gather(
+                batcher.submit(make_features(1)),
+                batcher.submit(bad),
+                batcher.submit(make_features(3)),
+                return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+
+        assert results[0] == 1.0
+        assert isinstance(results[1], ValueError)
+        assert results[2] == 3.0
+
+    async def test_stop_fails_queued_requests(self, mlp_globals, monkeypatch):
+        """Test stop() resolves in-flight and queued requests instead of leaving them pending"""
+        from predictor import serve
+
+        release = threading.Event()
+        monkeypatch.setattr(serve, 'predictFn', lambda X: (release.wait(5), X[:, 0])[1])
+
+        batcher = serve.MicroBatcher(maxBatchSize=1, maxLatencyMs=0)
+        batcher.start()
+        try:
+            inFlight = asyncio.ensure_future(batcher.submit(make_features(1)))
+            await asyncio.sleep(0.05)
+            queued = [asyncio.ensure_future(batcher.submit(make_features(i))) for i in range(3)]
+            await asyncio.sleep(0)
+
+            await batcher.stop()
+            results = await asyncio.wait_for(
+                asyncio.gather(inFlight, *queued, return_exceptions=True), timeout=1
+            )
+        finally:
+            release.set()
+
+        assert not batcher.running
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestScoreTiled:
+    """Test tiled scoring of large MLP batches"""
+
+    @pytest.mark.parametrize("rows,expected_calls", [(4, [4]), (5, [4, 1])])
+    async def test_tile_boundaries(self, mlp_globals, monkeypatch, rows, expected_calls):
+        """Test a matrix of exactly one tile is one call and one row more splits off a tile"""
+        from predictor import serve
+        monkeypatch.setattr(serve.serverConfig, 'predictTileRows', 4)
+
+        X = np.arange(rows * 21, dtype=np.float64).reshape(rows, 21)
+        scores = await serve._scoreTiled(X)
+
+        np.testing.assert_array_equal(scores, X[:, 0])
+        assert sorted(mlp_globals, reverse=True) == expected_calls
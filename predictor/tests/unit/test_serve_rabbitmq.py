@@ -12,19 +12,21 @@ from predictor import serve_rabbitmq
 from predictor.config import featureConfig
 
 
-@pytest.fixture
-def mock_model_files(tmp_path):
-    """Create mock model files"""
+@pytest.fixture(scope="session")
+def mock_model_files(tmp_path_factory):
+    """Create mock model files (written once per session; tests only read them)"""
+    model_dir = tmp_path_factory.mktemp('fixtures')
+
     # Create scaler file
     scaler_obj = {
         'scaler': None,
         'columns': [f'feature_{i}' for i in range(21)]
     }
-    scaler_path = tmp_path / 'scaler.pkl'
+    scaler_path = model_dir / 'scaler.pkl'
     joblib.dump(scaler_obj, scaler_path)
 
     # Create mock model file
-    model_path = tmp_path / 'model.bin'
+    model_path = model_dir / 'model.bin'
     model_path.write_text("mock model")
 
     return {